@@ -0,0 +1,41 @@
+"""Logon history user time index
+
+Revision ID: 3f9a6c1d2b7e
+Revises: 80c38462cc3f
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c1d2b7e'
+down_revision: Union[str, None] = '80c38462cc3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Индекс строится без блокировки записи в таблицу
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_logon_histories_user_id_logon_time',
+            'logon_histories',
+            ['user_id', sa.text('logon_time DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_logon_histories_user_id_logon_time',
+            table_name='logon_histories',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,122 @@
+"""Partition logon histories by month
+
+Revision ID: b81e4d0f5a93
+Revises: 3f9a6c1d2b7e
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81e4d0f5a93'
+down_revision: Union[str, None] = '3f9a6c1d2b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Число месяцев вперед, для которых секции создаются сразу
+PARTITIONS_AHEAD = 3
+
+
+def upgrade() -> None:
+    # Имена индексов уникальны в пределах схемы, поэтому старая таблица и ее индексы переименовываются
+    op.rename_table('logon_histories', 'logon_histories_legacy')
+    op.execute('ALTER INDEX IF EXISTS logon_histories_pkey RENAME TO logon_histories_legacy_pkey')
+    op.execute('ALTER INDEX IF EXISTS logon_histories_id_key RENAME TO logon_histories_legacy_id_key')
+    op.execute(
+        'ALTER INDEX IF EXISTS ix_logon_histories_user_id_logon_time '
+        'RENAME TO ix_logon_histories_legacy_user_id_logon_time'
+    )
+
+    # Первичный ключ секционированной таблицы обязан включать ключ секционирования
+    op.create_table('logon_histories',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('ip', sa.String(length=16), nullable=True),
+    sa.Column('user_agent', sa.String(length=255), nullable=True),
+    sa.Column('logon_time', sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id', 'logon_time'),
+    postgresql_partition_by='RANGE (logon_time)'
+    )
+
+    op.execute(f'''
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce(
+                        (SELECT min(coalesce(logon_time, created_at)) FROM logon_histories_legacy),
+                        timezone('utc', now())
+                    )),
+                    date_trunc('month', timezone('utc', now())) + interval '{PARTITIONS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF logon_histories FOR VALUES FROM (%L) TO (%L)',
+                    'logon_histories_' || to_char(month, '"y"YYYY"m"MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+            END LOOP;
+        END
+        $$
+    ''')
+
+    op.execute('''
+        INSERT INTO logon_histories (id, ip, user_agent, logon_time, created_at, user_id)
+        SELECT id, ip, user_agent, coalesce(logon_time, created_at, timezone('utc', now())), created_at, user_id
+        FROM logon_histories_legacy
+    ''')
+
+    op.drop_table('logon_histories_legacy')
+
+    op.create_index(
+        'ix_logon_histories_user_id_logon_time',
+        'logon_histories',
+        ['user_id', sa.text('logon_time DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.rename_table('logon_histories', 'logon_histories_partitioned')
+    op.execute('ALTER INDEX IF EXISTS logon_histories_pkey RENAME TO logon_histories_partitioned_pkey')
+    op.execute(
+        'ALTER INDEX IF EXISTS ix_logon_histories_user_id_logon_time '
+        'RENAME TO ix_logon_histories_partitioned_user_id_logon_time'
+    )
+
+    op.create_table('logon_histories',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('ip', sa.String(length=16), nullable=True),
+    sa.Column('user_agent', sa.String(length=255), nullable=True),
+    sa.Column('logon_time', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+
+    op.execute('''
+        INSERT INTO logon_histories (id, ip, user_agent, logon_time, created_at, user_id)
+        SELECT id, ip, user_agent, logon_time, created_at, user_id
+        FROM logon_histories_partitioned
+    ''')
+
+    op.drop_table('logon_histories_partitioned')
+
+    op.create_index(
+        'ix_logon_histories_user_id_logon_time',
+        'logon_histories',
+        ['user_id', sa.text('logon_time DESC'), sa.text('id DESC')],
+        unique=False
+    )
@@ -0,0 +1,182 @@
+import asyncio
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import orjson
+import typer
+
+from benchmarks.load import run_grpc_load, run_http_load
+from benchmarks.micro import run_micro
+from benchmarks.stores import close_stores, open_stores
+from core.config import jwt_settings, password_settings
+
+app = typer.Typer(help='Измерение производительности сервиса авторизации')
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return os.environ.get('BENCHMARK_COMMIT', 'unknown')
+
+
+async def run_suites(
+    suites: list[str],
+    real_stores: bool,
+    iterations: int,
+    password_iterations: int,
+    requests: int,
+    signin_requests: int,
+    concurrency: int
+) -> list[dict]:
+    revocation_filter_task, user_id = await open_stores(real_stores)
+
+    results = []
+    try:
+        if 'micro' in suites:
+            results += await run_micro(
+                user_id=user_id,
+                iterations=iterations,
+                password_iterations=password_iterations
+            )
+        if 'http' in suites:
+            results += await run_http_load(
+                requests=requests,
+                signin_requests=signin_requests,
+                concurrency=concurrency
+            )
+        if 'grpc' in suites:
+            results += await run_grpc_load(
+                user_id=user_id,
+                requests=requests,
+                concurrency=concurrency
+            )
+    finally:
+        await close_stores(real_stores, revocation_filter_task)
+
+    return results
+
+
+@app.command()
+def run(
+    suite: list[str] = typer.Option(
+        ['micro', 'http', 'grpc'],
+        help='Набор сценариев: micro, http, grpc'
+    ),
+    output: str = typer.Option(
+        'benchmark.json',
+        help='Файл результатов'
+    ),
+    real_stores: bool = typer.Option(
+        False,
+        help='Использовать Redis и Postgres из настроек вместо хранилищ в памяти'
+    ),
+    iterations: int = typer.Option(
+        5000,
+        help='Число измерений быстрых операций'
+    ),
+    password_iterations: int = typer.Option(
+        20,
+        help='Число измерений проверки пароля'
+    ),
+    requests: int = typer.Option(
+        2000,
+        help='Число запросов в нагрузочных сценариях'
+    ),
+    signin_requests: int = typer.Option(
+        100,
+        help='Число запросов входа, ограниченных скоростью хеширования паролей'
+    ),
+    concurrency: int = typer.Option(
+        16,
+        help='Число одновременных клиентов в нагрузочных сценариях'
+    )
+):
+    '''Запуск сценариев и сохранение результатов в JSON'''
+
+    results = asyncio.run(run_suites(
+        suites=suite,
+        real_stores=real_stores,
+        iterations=iterations,
+        password_iterations=password_iterations,
+        requests=requests,
+        signin_requests=signin_requests,
+        concurrency=concurrency
+    ))
+
+    report = {
+        'commit': get_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'parameters': {
+            'stores': 'real' if real_stores else 'memory',
+            'iterations': iterations,
+            'password_iterations': password_iterations,
+            'requests': requests,
+            'signin_requests': signin_requests,
+            'concurrency': concurrency,
+            'jwt_algorithm': jwt_settings.algorithm,
+            'password_executor': password_settings.executor
+        },
+        'results': results
+    }
+
+    with open(output, 'wb') as file:
+        file.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+
+    for result in results:
+        latency = result['latency_ms']
+        typer.echo(
+            f'{result["name"]:<30} {result["ops_per_sec"]:>12.2f} ops/s  '
+            f'p50 {latency["p50"]:>9.3f} ms  p99 {latency["p99"]:>9.3f} ms  '
+            f'errors {result["errors"]}'
+        )
+
+
+@app.command()
+def compare(
+    baseline: str = typer.Argument(..., help='Результаты базовой версии'),
+    candidate: str = typer.Argument(..., help='Результаты проверяемой версии')
+):
+    '''Сравнение двух файлов результатов по пропускной способности и задержкам'''
+
+    with open(baseline, 'rb') as file:
+        baseline_report = orjson.loads(file.read())
+    with open(candidate, 'rb') as file:
+        candidate_report = orjson.loads(file.read())
+
+    if baseline_report['parameters'] != candidate_report['parameters']:
+        typer.echo('Warning: reports were produced with different parameters')
+
+    baseline_results = {result['name']: result for result in baseline_report['results']}
+
+    typer.echo(f'{baseline_report["commit"]} -> {candidate_report["commit"]}')
+    for result in candidate_report['results']:
+        base = baseline_results.get(result['name'])
+        if base is None:
+            continue
+
+        changes = [
+            ('ops/s', base['ops_per_sec'], result['ops_per_sec']),
+            ('p50', base['latency_ms']['p50'], result['latency_ms']['p50']),
+            ('p99', base['latency_ms']['p99'], result['latency_ms']['p99'])
+        ]
+        typer.echo(f'{result["name"]:<30} ' + '  '.join(
+            f'{label} {old:.3f} -> {new:.3f} ({(new - old) / old * 100 if old else 0:+.1f}%)'
+            for label, old, new in changes
+        ))
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,109 @@
+import asyncio
+import statistics
+import time
+
+
+def summarize(
+    name: str,
+    latencies: list[float],
+    elapsed: float,
+    errors: int = 0
+) -> dict:
+    '''
+    Функция расчета пропускной способности и перцентилей задержки
+
+    :param name: название сценария
+    :param latencies: длительности отдельных операций, секунд
+    :param elapsed: общая длительность сценария, секунд
+    :param errors: число неуспешных операций
+    '''
+
+    operations = len(latencies)
+    latencies = sorted(latencies) or [0.0]
+    if operations > 1:
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    else:
+        quantiles = latencies * 99
+
+    return {
+        'name': name,
+        'operations': operations,
+        'errors': errors,
+        'ops_per_sec': round(operations / elapsed, 2) if elapsed else 0,
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies) * 1000, 4),
+            'p50': round(quantiles[49] * 1000, 4),
+            'p95': round(quantiles[94] * 1000, 4),
+            'p99': round(quantiles[98] * 1000, 4),
+            'max': round(latencies[-1] * 1000, 4)
+        }
+    }
+
+
+def measure(
+    name: str,
+    func,
+    iterations: int,
+    warmup: int = 10
+) -> dict:
+    '''
+    Функция измерения синхронной операции
+
+    :param func: функция, принимающая номер итерации; прогревочные вызовы
+                 получают номера, следующие за измеряемыми
+    :param iterations: число измеряемых вызовов
+    :param warmup: число вызовов до начала измерения
+    '''
+
+    for index in range(iterations, iterations + warmup):
+        func(index)
+
+    latencies = []
+    started = time.perf_counter()
+    for index in range(iterations):
+        start = time.perf_counter()
+        func(index)
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(name, latencies, time.perf_counter() - started)
+
+
+async def measure_async(
+    name: str,
+    func,
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 10
+) -> dict:
+    '''
+    Функция измерения асинхронной операции при заданном числе одновременных вызовов.
+    Неуспешные вызовы учитываются отдельно и не входят в перцентили
+
+    :param func: корутинная функция, принимающая номер итерации
+    :param iterations: общее число измеряемых вызовов
+    :param concurrency: число одновременно выполняющихся вызовов
+    :param warmup: число вызовов до начала измерения
+    '''
+
+    for index in range(iterations, iterations + warmup):
+        await func(index)
+
+    latencies = []
+    errors = 0
+    counter = iter(range(iterations))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            start = time.perf_counter()
+            try:
+                await func(index)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(name, latencies, time.perf_counter() - started, errors)
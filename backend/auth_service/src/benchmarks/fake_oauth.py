@@ -0,0 +1,98 @@
+import asyncio
+import random
+import secrets
+
+import typer
+from aiohttp import web
+
+app = typer.Typer(help='Локальный сервис внешней авторизации для проверки клиента OAuth')
+
+
+def create_app(
+    latency: float,
+    error_rate: float,
+    error_status: int
+) -> web.Application:
+    '''
+    Функция создания приложения, имитирующего сервис внешней авторизации.
+    Любой код авторизации, кроме invalid, обменивается на токен;
+    часть ответов задерживается и завершается ошибкой с заданной вероятностью
+
+    :param latency: задержка ответа, секунд
+    :param error_rate: доля ответов с ошибкой
+    :param error_status: код ответа с ошибкой
+    '''
+
+    @web.middleware
+    async def degradation_middleware(request, handler):
+        if latency:
+            await asyncio.sleep(latency)
+        if random.random() < error_rate:
+            return web.Response(status=error_status)
+
+        return await handler(request)
+
+    async def authorize(request: web.Request) -> web.Response:
+        raise web.HTTPFound(
+            f'{request.query.get("redirect_uri", "/")}?code={secrets.token_urlsafe(8)}'
+        )
+
+    async def token(request: web.Request) -> web.Response:
+        data = await request.post()
+        if data.get('code') in (None, 'invalid'):
+            return web.json_response(
+                {'error': 'invalid_grant'},
+                status=400
+            )
+
+        return web.json_response({
+            'access_token': secrets.token_urlsafe(16),
+            'token_type': 'bearer'
+        })
+
+    async def user_info(request: web.Request) -> web.Response:
+        if not request.headers.get('Authorization'):
+            return web.json_response(
+                {'error': 'unauthorized'},
+                status=401
+            )
+
+        user_id = secrets.token_hex(8)
+        return web.json_response({
+            'id': user_id,
+            'default_email': f'{user_id}@fake-oauth.local',
+            'first_name': 'Fake',
+            'last_name': 'User'
+        })
+
+    application = web.Application(middlewares=[degradation_middleware])
+    application.router.add_get('/authorize', authorize)
+    application.router.add_post('/token', token)
+    application.router.add_get('/info', user_info)
+
+    return application
+
+
+@app.command()
+def run(
+    host: str = typer.Option('127.0.0.1', help='Адрес сервера'),
+    port: int = typer.Option(8090, help='Порт сервера'),
+    latency: float = typer.Option(0, help='Задержка ответа, секунд'),
+    error_rate: float = typer.Option(0, help='Доля ответов с ошибкой'),
+    error_status: int = typer.Option(503, help='Код ответа с ошибкой')
+):
+    '''Запуск локального сервиса внешней авторизации'''
+
+    web.run_app(
+        create_app(
+            latency=latency,
+            error_rate=error_rate,
+            error_status=error_status
+        ),
+        host=host,
+        port=port
+    )
+
+
+if __name__ == '__main__':
+    app()
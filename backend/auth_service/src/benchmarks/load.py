@@ -0,0 +1,164 @@
+import asyncio
+import socket
+
+import aiohttp
+import grpc
+import uvicorn
+
+from benchmarks.common import measure_async
+from benchmarks.stores import BENCHMARK_EMAIL, BENCHMARK_PASSWORD
+from main import app
+from rpc.authenticator_server.server import get_authenticator_server
+from rpc.authenticator_server.types import (authenticator_pb2,
+                                            authenticator_pb2_grpc)
+from services.jwt import BasicJWTService
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def start_http_server() -> tuple[uvicorn.Server, asyncio.Task, str]:
+    '''
+    Функция запуска приложения в текущем процессе. Хранилища подготавливаются
+    заранее, поэтому lifespan приложения не выполняется
+    '''
+
+    port = get_free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        app,
+        host='127.0.0.1',
+        port=port,
+        lifespan='off',
+        access_log=False,
+        log_level='warning'
+    ))
+    task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    return server, task, f'http://127.0.0.1:{port}'
+
+
+async def sign_in(
+    session: aiohttp.ClientSession,
+    base_url: str
+) -> None:
+    async with session.post(
+        f'{base_url}/api/v1/signin/local',
+        json={
+            'email': BENCHMARK_EMAIL,
+            'password': BENCHMARK_PASSWORD
+        }
+    ) as response:
+        response.raise_for_status()
+
+
+async def run_http_load(
+    requests: int,
+    signin_requests: int,
+    concurrency: int
+) -> list[dict]:
+    '''
+    Функция нагрузочных сценариев HTTP API
+
+    :param requests: число запросов обновления токенов
+    :param signin_requests: число запросов входа
+    :param concurrency: число одновременно работающих клиентов
+    '''
+
+    server, task, base_url = await start_http_server()
+
+    # У каждого клиента собственные cookie, поэтому клиенты выдаются из очереди
+    sessions = [
+        aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True))
+        for _ in range(concurrency)
+    ]
+    clients: asyncio.Queue[aiohttp.ClientSession] = asyncio.Queue()
+    for session in sessions:
+        clients.put_nowait(session)
+
+    async def with_client(request):
+        client = await clients.get()
+        try:
+            await request(client)
+        finally:
+            clients.put_nowait(client)
+
+    async def refresh(client: aiohttp.ClientSession) -> None:
+        async with client.get(f'{base_url}/api/v1/account/refresh_tokens') as response:
+            response.raise_for_status()
+
+    try:
+        results = [await measure_async(
+            'http.signin_local',
+            lambda index: with_client(lambda client: sign_in(client, base_url)),
+            signin_requests,
+            concurrency=concurrency,
+            warmup=1
+        )]
+
+        for session in sessions:
+            await sign_in(session, base_url)
+
+        results.append(await measure_async(
+            'http.refresh_tokens',
+            lambda index: with_client(refresh),
+            requests,
+            concurrency=concurrency
+        ))
+    finally:
+        for session in sessions:
+            await session.close()
+
+        server.should_exit = True
+        await task
+
+    return results
+
+
+async def run_grpc_load(
+    user_id: str,
+    requests: int,
+    concurrency: int
+) -> list[dict]:
+    '''
+    Функция нагрузочного сценария gRPC-метода CheckToken
+
+    :param user_id: ID пользователя сценариев
+    :param requests: число запросов
+    :param concurrency: число одновременных запросов
+    '''
+
+    port = get_free_port()
+    server = get_authenticator_server(
+        port=port
+    )
+    await server.start()
+
+    access_token = BasicJWTService().create_access_token(
+        email=BENCHMARK_EMAIL,
+        user_id=user_id
+    )
+
+    async def check_token(index: int) -> None:
+        response = await stub.CheckToken(
+            authenticator_pb2.Token(token=access_token)
+        )
+        if not response.is_valid:
+            raise ValueError('Token is not valid')
+
+    try:
+        async with grpc.aio.insecure_channel(f'127.0.0.1:{port}') as channel:
+            stub = authenticator_pb2_grpc.AuthenticatorStub(channel)
+            return [await measure_async(
+                'grpc.check_token',
+                check_token,
+                requests,
+                concurrency=concurrency
+            )]
+    finally:
+        await server.stop(grace=None)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from fastapi import Request
+
+from benchmarks.common import measure, measure_async
+from benchmarks.stores import BENCHMARK_EMAIL, BENCHMARK_PASSWORD
+from core.globals import COOKIE_PREFIX
+from dependencies import password, redis
+from services.jwt import BasicJWTService, JWTService
+from utils.wrappers import if_token_is_valid
+
+
+def get_request(
+    access_token: str
+) -> Request:
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/',
+        'headers': [
+            (b'cookie', f'{COOKIE_PREFIX}_access_token={access_token}'.encode())
+        ]
+    })
+
+
+@if_token_is_valid
+async def protected_endpoint(
+    request: Request,
+    jwt_session: JWTService
+) -> None:
+    return None
+
+
+async def run_micro(
+    user_id: str,
+    iterations: int,
+    password_iterations: int
+) -> list[dict]:
+    '''
+    Функция измерения отдельных операций без HTTP-слоя
+
+    :param user_id: ID пользователя сценариев
+    :param iterations: число измерений быстрых операций
+    :param password_iterations: число измерений проверки пароля
+    '''
+
+    basic_jwt_session = BasicJWTService()
+    jwt_session = JWTService(redis.redis_session)
+    lifetime = timedelta(minutes=15)
+
+    def create_token(index: int) -> str:
+        return basic_jwt_session._create_token(
+            email=BENCHMARK_EMAIL,
+            user_id=user_id,
+            expires_delta=lifetime
+        )
+
+    tokens = [create_token(index) for index in range(iterations + 10)]
+    results = [
+        measure('jwt.create_token', create_token, iterations)
+    ]
+
+    # Каждый токен проверяется впервые, поэтому результат не берется из кеша
+    results.append(measure(
+        'jwt.check_token.uncached',
+        lambda index: basic_jwt_session.check_token(tokens[index]),
+        iterations
+    ))
+    results.append(measure(
+        'jwt.check_token.cached',
+        lambda index: basic_jwt_session.check_token(tokens[0]),
+        iterations
+    ))
+
+    results.append(await measure_async(
+        'jwt.verify_access_token',
+        lambda index: jwt_session.verify_access_token(tokens[index % len(tokens)]),
+        iterations
+    ))
+
+    results.append(await measure_async(
+        'wrappers.if_token_is_valid',
+        lambda index: protected_endpoint(
+            request=get_request(tokens[index % len(tokens)]),
+            jwt_session=jwt_session
+        ),
+        iterations
+    ))
+
+    password_hash = await password.password_hasher.hash_password(
+        password=BENCHMARK_PASSWORD
+    )
+    results.append(await measure_async(
+        'password.check_password',
+        lambda index: password.password_hasher.check_password(
+            password_hash=password_hash,
+            password=BENCHMARK_PASSWORD
+        ),
+        password_iterations,
+        warmup=1
+    ))
+
+    return results
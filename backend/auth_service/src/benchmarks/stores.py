@@ -0,0 +1,173 @@
+import asyncio
+import uuid
+from collections import namedtuple
+
+from core.config import (logon_history_settings, password_settings,
+                         rate_limit_settings)
+from core.lifecycle import close_storage, open_storage
+from crud.user import create_user, get_user_ids
+from dependencies import (logon_history, password, postgres, rate_limit,
+                          redis)
+
+BENCHMARK_EMAIL = 'benchmark@example.com'
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+
+class FakeResult:
+    def __init__(
+        self,
+        rows: list
+    ):
+        self.rows = rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self) -> list:
+        return self.rows
+
+    def scalar_one_or_none(self):
+        return self.rows[0][0] if self.rows else None
+
+
+class FakeSession:
+    '''
+    Сессия БД в памяти. Поддерживает выборку столбцов пользователей по email
+    и игнорирует изменяющие запросы; этого достаточно для сценариев входа и обновления токенов
+    '''
+
+    def __init__(
+        self,
+        users: dict[str, dict]
+    ):
+        self.users = users
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def execute(
+        self,
+        statement,
+        params=None
+    ) -> FakeResult:
+        if not statement.is_select:
+            return FakeResult([])
+
+        emails = set()
+        for value in statement.compile().params.values():
+            emails.update(value if isinstance(value, (list, tuple, set)) else [value])
+
+        columns = [column['name'] for column in statement.column_descriptions]
+        row_type = namedtuple('Row', columns)
+
+        return FakeResult([
+            row_type(*(user[column] for column in columns))
+            for email, user in self.users.items()
+            if email in emails
+        ])
+
+    async def commit(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class FakeSessionmaker:
+    def __init__(self):
+        self.users: dict[str, dict] = {}
+
+    def __call__(self) -> FakeSession:
+        return FakeSession(self.users)
+
+
+async def open_stores(
+    real_stores: bool
+) -> tuple[asyncio.Task | None, str]:
+    '''
+    Функция подготовки хранилищ и пользователя для сценариев.
+    По умолчанию используются Redis и БД в памяти процесса
+
+    :param real_stores: использовать Redis и Postgres из настроек сервиса
+    :return: задача фильтра отозванных токенов и ID пользователя сценариев
+    '''
+
+    password.password_hasher = password.get_password_hasher(
+        executor=password_settings.executor,
+        max_workers=password_settings.max_workers,
+        max_queue_size=password_settings.max_queue_size
+    )
+    password_hash = await password.password_hasher.hash_password(
+        password=BENCHMARK_PASSWORD
+    )
+
+    revocation_filter_task = None
+    if real_stores:
+        revocation_filter_task = await open_storage()
+
+        async with postgres.async_session() as db_session:
+            await create_user(
+                db_session=db_session,
+                email=BENCHMARK_EMAIL,
+                password_hash=password_hash,
+                first_name='Benchmark',
+                last_name='User'
+            )
+            user_ids = await get_user_ids(
+                db_session=db_session,
+                emails=[BENCHMARK_EMAIL]
+            )
+        user_id = str(user_ids[BENCHMARK_EMAIL])
+    else:
+        # fakeredis нужен только для запуска сценариев без внешних сервисов
+        from fakeredis.aioredis import FakeRedis
+
+        redis.redis_session = FakeRedis(decode_responses=True)
+        postgres.async_session = FakeSessionmaker()
+
+        user_id = str(uuid.uuid4())
+        postgres.async_session.users[BENCHMARK_EMAIL] = {
+            'id': uuid.UUID(user_id),
+            'email': BENCHMARK_EMAIL,
+            'password': password_hash
+        }
+
+    logon_history.logon_history_writer = logon_history.get_logon_history_writer(
+        sessionmaker=postgres.async_session,
+        max_queue_size=logon_history_settings.max_queue_size,
+        batch_size=logon_history_settings.batch_size,
+        flush_interval=logon_history_settings.flush_interval,
+        overflow_policy=logon_history_settings.overflow_policy
+    )
+    logon_history.logon_history_writer.start()
+
+    # все запросы сценариев идут с одного адреса от одного пользователя
+    rate_limit.rate_limiter = rate_limit.get_rate_limiter(
+        redis_session=redis.redis_session,
+        enabled=False,
+        period=rate_limit_settings.period,
+        limits={}
+    )
+
+    return revocation_filter_task, user_id
+
+
+async def close_stores(
+    real_stores: bool,
+    revocation_filter_task: asyncio.Task | None
+) -> None:
+    await logon_history.logon_history_writer.close(
+        timeout=logon_history_settings.drain_timeout
+    )
+
+    password.password_hasher.shutdown()
+
+    if real_stores:
+        await close_storage(
+            revocation_filter_task=revocation_filter_task
+        )
+    else:
+        await redis.redis_session.close()
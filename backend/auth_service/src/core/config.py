@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,7 +7,25 @@ class AuthAPISettings(BaseSettings):
     '''Класс, содержащий настройки сервиса авторизации'''
 
     model_config = SettingsConfigDict(env_prefix='AUTH_API_')
+    port: int = 5000
     authenticator_port: int
+    grpc_embedded: bool = True
+    http_workers: int = 1
+    grpc_workers: int = 1
+    shutdown_timeout: float = 30
+    worker_restart_base_delay: float = 0.5
+    worker_restart_max_delay: float = 30
+    worker_max_start_failures: int = 5
+    ready_file: str | None = None
+    forwarded_allow_ips: str = '127.0.0.1'
+    max_batch_size: int = 1000
+    introspect_batch_window_ms: float = 5
+    introspect_max_pending: int = 1000
+    grpc_maximum_concurrent_rpcs: int | None = None
+    grpc_keepalive_time_ms: int = 30000
+    grpc_keepalive_timeout_ms: int = 10000
+    grpc_max_message_length: int = 4 * 1024 * 1024
+    grpc_compression: Literal['none', 'deflate', 'gzip'] = 'none'
 
 
 class PostgresSettings(BaseSettings):
@@ -17,6 +37,12 @@ class PostgresSettings(BaseSettings):
     user: str
     password: str
     dbname: str
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
+    statement_cache_size: int = 100
 
 
 class RedisSettings(BaseSettings):
@@ -25,6 +51,45 @@ class RedisSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix='AUTH_REDIS_')
     host: str
     port: int
+    max_connections: int = 100
+    pool_timeout: float = 1
+    health_check_interval: int = 30
+    socket_timeout: float = 1
+    socket_connect_timeout: float = 1
+
+
+class UserCacheSettings(BaseSettings):
+    '''Класс, содержащий настройки кеша соответствия email и ID пользователей'''
+
+    model_config = SettingsConfigDict(env_prefix='AUTH_USER_CACHE_')
+    local_size: int = 10000
+    local_ttl: int = 60
+    redis_ttl: int = 86400
+    negative_ttl: int = 30
+
+
+class PasswordSettings(BaseSettings):
+    '''Класс, содержащий настройки пула хеширования паролей'''
+
+    model_config = SettingsConfigDict(env_prefix='AUTH_PASSWORD_')
+    executor: Literal['thread', 'process'] = 'thread'
+    max_workers: int = 4
+    max_queue_size: int = 64
+
+
+class LogonHistorySettings(BaseSettings):
+    '''Класс, содержащий настройки буферизованной записи истории авторизаций'''
+
+    model_config = SettingsConfigDict(env_prefix='AUTH_LOGON_HISTORY_')
+    max_queue_size: int = 10000
+    batch_size: int = 500
+    flush_interval: float = 1
+    overflow_policy: Literal['drop_newest', 'drop_oldest', 'block'] = 'drop_newest'
+    drain_timeout: float = 10
+    partitions_ahead: int = 3
+    retention_months: int = 12
+    archive_schema: str | None = None
+    maintenance_interval: float = 3600
 
 
 class JWTSettings(BaseSettings):
@@ -32,8 +97,56 @@ class JWTSettings(BaseSettings):
 
     model_config = SettingsConfigDict(env_prefix='AUTH_JWT_')
     secret: str
+    algorithm: Literal['HS256', 'ES256', 'ES384', 'RS256'] = 'HS256'
+    signing_keys_dir: str | None = None
+    active_key_id: str | None = None
+    legacy_hs256_verification: bool = True
+    jwks_max_age: int = 300
     access_lifetime: int
     refresh_lifetime: int
+    token_cache_size: int = 10000
+    token_cache_ttl: int = 300
+    legacy_denylist_lookup: bool = True
+    revocation_filter_enabled: bool = True
+    revocation_filter_capacity: int = 1000000
+    revocation_filter_error_rate: float = 0.001
+    revocation_filter_rebuild_interval: int = 300
+
+
+class OauthClientSettings(BaseSettings):
+    '''Класс, содержащий настройки HTTP-клиента внешних сервисов авторизации'''
+
+    model_config = SettingsConfigDict(env_prefix='AUTH_OAUTH_')
+    limit: int = 100
+    limit_per_host: int = 20
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30
+    connect_timeout: float = 5
+    request_timeout: float = 10
+    max_concurrency: int = 50
+    queue_timeout: float = 1
+    retry_attempts: int = 3
+    retry_base_delay: float = 0.1
+    retry_max_delay: float = 1
+    failure_threshold: int = 5
+    reset_timeout: float = 30
+
+
+class RateLimitSettings(BaseSettings):
+    '''
+    Класс, содержащий ограничения частоты запросов к маршрутам сервиса авторизации.
+    Значение поля - число запросов за period секунд, 0 отключает ограничение
+    '''
+
+    model_config = SettingsConfigDict(env_prefix='AUTH_RATE_LIMIT_')
+    enabled: bool = True
+    period: int = 60
+    signin_ip: int = 30
+    signin_account: int = 10
+    signup_ip: int = 10
+    oauth_signup_ip: int = 20
+    change_password_ip: int = 10
+    change_password_account: int = 5
 
 
 class GoogleSettings(BaseSettings):
@@ -43,6 +156,9 @@ class GoogleSettings(BaseSettings):
     client_id: str
     client_secret: str
     redirect_uri: str
+    authorize_url: str = 'https://accounts.google.com/o/oauth2/auth'
+    token_url: str = 'https://accounts.google.com/o/oauth2/token'
+    user_info_url: str = 'https://www.googleapis.com/oauth2/v1/userinfo'
 
 
 class YandexSettings(BaseSettings):
@@ -52,6 +168,17 @@ class YandexSettings(BaseSettings):
     client_id: str
     client_secret: str
     redirect_uri: str
+    authorize_url: str = 'https://oauth.yandex.ru/authorize'
+    token_url: str = 'https://oauth.yandex.ru/token'
+    user_info_url: str = 'https://login.yandex.ru/info'
+
+
+class MetricsSettings(BaseSettings):
+    '''Класс, содержащий настройки сбора метрик сервиса авторизации'''
+
+    model_config = SettingsConfigDict(env_prefix='AUTH_METRICS_')
+    multiproc_dir: str | None = '/tmp/auth_metrics'
+    event_loop_lag_interval: float = 0.5
 
 
 class JaegerSettings(BaseSettings):
@@ -74,8 +201,14 @@ class LogstashSettings(BaseSettings):
 auth_api_settings = AuthAPISettings()
 postgres_settings = PostgresSettings()
 redis_settings = RedisSettings()
+password_settings = PasswordSettings()
+user_cache_settings = UserCacheSettings()
+logon_history_settings = LogonHistorySettings()
 jwt_settings = JWTSettings()
+oauth_client_settings = OauthClientSettings()
+rate_limit_settings = RateLimitSettings()
 google_settings = GoogleSettings()
 yandex_settings = YandexSettings()
+metrics_settings = MetricsSettings()
 jaeger_settings = JaegerSettings()
 logstash_settings = LogstashSettings()
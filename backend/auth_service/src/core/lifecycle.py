@@ -0,0 +1,79 @@
+import asyncio
+
+from core.config import jwt_settings, postgres_settings, redis_settings
+from dependencies import postgres, redis
+from services import revocation
+from services.jwt import DENYLIST_PREFIX
+
+
+async def open_storage() -> asyncio.Task | None:
+    '''
+    Функция подключения к Redis и Postgres, общая для HTTP- и gRPC-процессов
+
+    :return: задача синхронизации фильтра отозванных токенов, если фильтр включен
+    '''
+
+    redis.redis_session = redis.get_redis(
+        connection_pool=redis.get_redis_pool(
+            host=redis_settings.host,
+            port=redis_settings.port,
+            max_connections=redis_settings.max_connections,
+            pool_timeout=redis_settings.pool_timeout,
+            health_check_interval=redis_settings.health_check_interval,
+            socket_timeout=redis_settings.socket_timeout,
+            socket_connect_timeout=redis_settings.socket_connect_timeout
+        )
+    )
+
+    postgres.engine = postgres.get_engine(
+        user=postgres_settings.user,
+        password=postgres_settings.password,
+        host=postgres_settings.host,
+        port=postgres_settings.port,
+        dbname=postgres_settings.dbname,
+        pool_size=postgres_settings.pool_size,
+        max_overflow=postgres_settings.max_overflow,
+        pool_timeout=postgres_settings.pool_timeout,
+        pool_pre_ping=postgres_settings.pool_pre_ping,
+        pool_recycle=postgres_settings.pool_recycle,
+        statement_cache_size=postgres_settings.statement_cache_size
+    )
+    postgres.async_session = postgres.get_sessionmaker(
+        engine=postgres.engine
+    )
+
+    if not jwt_settings.revocation_filter_enabled:
+        return None
+
+    revocation.revocation_filter = revocation.RevocationFilter(
+        redis_session=redis.redis_session,
+        key_patterns=[f'{DENYLIST_PREFIX}*'] + (
+            ['eyJ*'] if jwt_settings.legacy_denylist_lookup else []
+        ),
+        capacity=jwt_settings.revocation_filter_capacity,
+        error_rate=jwt_settings.revocation_filter_error_rate,
+        rebuild_interval=jwt_settings.revocation_filter_rebuild_interval
+    )
+
+    return asyncio.create_task(
+        revocation.revocation_filter.run()
+    )
+
+
+async def close_storage(
+    revocation_filter_task: asyncio.Task | None
+) -> None:
+    '''
+    Функция закрытия подключений к Redis и Postgres
+
+    :param revocation_filter_task: задача синхронизации фильтра отозванных токенов
+    '''
+
+    if revocation_filter_task is not None:
+        revocation_filter_task.cancel()
+
+    await postgres.engine.dispose()
+
+    await redis.redis_session.close(
+        close_connection_pool=True
+    )
@@ -0,0 +1,171 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# В многопроцессном режиме значения датчиков (Gauge) агрегируются по работающим
+# процессам способом, указанным в multiprocess_mode
+
+HTTP_LATENCY = Histogram(
+    name='auth_http_request_duration_seconds',
+    documentation='Длительность HTTP-запросов по шаблонам маршрутов',
+    labelnames=['method', 'route', 'status'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+HTTP_IN_FLIGHT = Gauge(
+    name='auth_http_in_flight_requests',
+    documentation='Количество выполняющихся HTTP-запросов',
+    multiprocess_mode='livesum'
+)
+
+EVENT_LOOP_LAG = Histogram(
+    name='auth_event_loop_lag_seconds',
+    documentation='Задержка выполнения периодической задачи относительно расписания цикла событий',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+)
+
+JWT_LATENCY = Histogram(
+    name='auth_jwt_operation_duration_seconds',
+    documentation='Длительность подписи и проверки подписи токенов: encode, decode',
+    labelnames=['operation'],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025)
+)
+
+REDIS_COMMAND_LATENCY = Histogram(
+    name='auth_redis_command_duration_seconds',
+    documentation='Длительность команд Redis, включая ожидание соединения из пула',
+    labelnames=['command'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+)
+
+REDIS_POOL_IN_USE = Gauge(
+    name='auth_redis_pool_in_use_connections',
+    documentation='Количество соединений, выданных из пула Redis',
+    multiprocess_mode='livesum'
+)
+
+POSTGRES_QUERY_LATENCY = Histogram(
+    name='auth_postgres_query_duration_seconds',
+    documentation='Длительность выполнения запросов к Postgres по типу запроса',
+    labelnames=['operation'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+POSTGRES_POOL_CHECKOUT_WAIT = Histogram(
+    name='auth_postgres_pool_checkout_wait_seconds',
+    documentation='Время ожидания соединения из пула Postgres',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+POSTGRES_POOL_CHECKED_OUT = Gauge(
+    name='auth_postgres_pool_checked_out_connections',
+    documentation='Количество соединений, выданных из пула Postgres',
+    multiprocess_mode='livesum'
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    name='auth_password_hash_queue_depth',
+    documentation='Количество операций хеширования паролей, ожидающих или выполняемых в пуле',
+    multiprocess_mode='livesum'
+)
+
+PASSWORD_HASH_LATENCY = Histogram(
+    name='auth_password_hash_seconds',
+    documentation='Время выполнения операции хеширования пароля, включая ожидание в очереди',
+    labelnames=['operation'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    name='auth_password_hash_rejected_total',
+    documentation='Количество операций хеширования паролей, отклоненных из-за переполнения очереди',
+    labelnames=['operation']
+)
+
+JWT_CACHE_REQUESTS = Counter(
+    name='auth_jwt_cache_requests_total',
+    documentation='Количество обращений к кешу проверенных токенов',
+    labelnames=['result']
+)
+
+REVOCATION_FILTER_CHECKS = Counter(
+    name='auth_revocation_filter_checks_total',
+    documentation='Результаты проверок по фильтру отозванных токенов: negative, true_positive, false_positive',
+    labelnames=['result']
+)
+
+REVOCATION_FILTER_ITEMS = Gauge(
+    name='auth_revocation_filter_items',
+    documentation='Количество ключей в фильтре отозванных токенов',
+    multiprocess_mode='livemax'
+)
+
+REVOCATION_FILTER_ESTIMATED_FPR = Gauge(
+    name='auth_revocation_filter_estimated_false_positive_rate',
+    documentation='Оценка вероятности ложноположительного ответа фильтра отозванных токенов',
+    multiprocess_mode='livemax'
+)
+
+GRPC_IN_FLIGHT = Gauge(
+    name='auth_grpc_in_flight_requests',
+    documentation='Количество выполняющихся gRPC-вызовов',
+    labelnames=['method'],
+    multiprocess_mode='livesum'
+)
+
+GRPC_LATENCY = Histogram(
+    name='auth_grpc_request_duration_seconds',
+    documentation='Длительность gRPC-вызовов',
+    labelnames=['method', 'status'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+USER_CACHE_LOOKUPS = Counter(
+    name='auth_user_cache_lookups_total',
+    documentation='Результаты поиска ID пользователя в кеше: local_hit, redis_hit, miss',
+    labelnames=['result']
+)
+
+USER_CACHE_FALLTHROUGH_LATENCY = Histogram(
+    name='auth_user_cache_fallthrough_seconds',
+    documentation='Длительность запроса к БД при промахе кеша ID пользователей',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+)
+
+LOGON_HISTORY_QUEUE_DEPTH = Gauge(
+    name='auth_logon_history_queue_depth',
+    documentation='Количество записей истории авторизаций, ожидающих записи в БД',
+    multiprocess_mode='livesum'
+)
+
+LOGON_HISTORY_DROPPED = Counter(
+    name='auth_logon_history_dropped_total',
+    documentation='Количество потерянных записей истории авторизаций: overflow, error, shutdown',
+    labelnames=['reason']
+)
+
+LOGON_HISTORY_FLUSH_LATENCY = Histogram(
+    name='auth_logon_history_flush_duration_seconds',
+    documentation='Длительность пакетной записи истории авторизаций в БД',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+OAUTH_REQUESTS = Counter(
+    name='auth_oauth_requests_total',
+    documentation=(
+        'Результаты обращений к внешним сервисам авторизации: '
+        'ok, client_error, error, retry, rejected, circuit_open'
+    ),
+    labelnames=['provider', 'operation', 'result']
+)
+
+OAUTH_CIRCUIT_OPEN = Gauge(
+    name='auth_oauth_circuit_open',
+    documentation='Разомкнут ли предохранитель обращений к внешнему сервису авторизации',
+    labelnames=['provider'],
+    multiprocess_mode='livemax'
+)
+
+RATE_LIMIT_CHECKS = Counter(
+    name='auth_rate_limit_checks_total',
+    documentation='Результаты проверки ограничений частоты запросов: allowed, limited, error',
+    labelnames=['route', 'result']
+)
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from core.metrics import EVENT_LOOP_LAG, HTTP_IN_FLIGHT, HTTP_LATENCY
+
+
+class MetricsMiddleware:
+    '''
+    ASGI-промежуточный слой, фиксирующий число выполняющихся HTTP-запросов
+    и их длительность по шаблонам маршрутов
+    '''
+
+    def __init__(
+        self,
+        app
+    ):
+        self.app = app
+
+    async def __call__(
+        self,
+        scope,
+        receive,
+        send
+    ):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_LATENCY.labels(
+                scope['method'],
+                self._get_route(scope),
+                status_code
+            ).observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _get_route(
+        scope
+    ) -> str:
+        '''
+        Функция получения шаблона маршрута. Маршрут заполняется роутером FastAPI
+        после сопоставления пути; все запросы без сопоставленного маршрута
+        (404, 405, ответы промежуточных обработчиков) объединяются,
+        чтобы произвольные пути не увеличивали число серий
+        '''
+
+        route = scope.get('route')
+        if route is not None:
+            return route.path
+
+        return 'unmatched'
+
+
+async def monitor_event_loop_lag(
+    interval: float
+) -> None:
+    '''
+    Функция измерения задержки цикла событий: периодическая задача
+    фиксирует, насколько позже запланированного она была возобновлена
+
+    :param interval: интервал измерения, секунд
+    '''
+
+    loop = asyncio.get_running_loop()
+
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(loop.time() - start - interval, 0))
+
+
+def render_metrics() -> bytes:
+    '''
+    Функция формирования метрик в текстовом формате Prometheus.
+    При запуске нескольких процессов значения собираются из файлов всех процессов
+    '''
+
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return generate_latest(REGISTRY)
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+
+    return generate_latest(registry)
@@ -1,4 +1,7 @@
-from sqlalchemy import select
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.models import LogonHistory
@@ -22,8 +25,41 @@ async def get_auth_history(
     result = await db_session.execute(
         select(LogonHistory)
         .where(LogonHistory.user_id == user_id)
+        .order_by(LogonHistory.logon_time.desc(), LogonHistory.id.desc())
         .offset(offset_value)
         .limit(page_size)
     )
 
     return result.scalars().all()
+
+
+async def get_auth_history_after(
+    db_session: AsyncSession,
+    user_id: str,
+    page_size: int,
+    after: tuple[datetime, uuid.UUID] | None = None
+) -> list[LogonHistory]:
+    '''
+    Функция для получения историй авторизаций пользователя, предшествующих
+    указанной записи. Поиск выполняется по индексу без пропуска строк
+
+    :param user_id: ID проверяемого пользователя
+    :param page_size: размер страницы
+    :param after: время авторизации и ID последней записи предыдущей страницы
+    '''
+
+    query = (
+        select(LogonHistory)
+        .where(LogonHistory.user_id == user_id)
+        .order_by(LogonHistory.logon_time.desc(), LogonHistory.id.desc())
+        .limit(page_size)
+    )
+
+    if after is not None:
+        query = query.where(
+            tuple_(LogonHistory.logon_time, LogonHistory.id) < tuple_(*after)
+        )
+
+    result = await db_session.execute(query)
+
+    return result.scalars().all()
@@ -0,0 +1,206 @@
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+PARENT_TABLE = 'logon_histories'
+
+PARTITION_NAME = re.compile(rf'^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$')
+
+MAINTENANCE_LOCK = f'{PARENT_TABLE}_maintenance'
+
+
+def get_current_month() -> date:
+    '''
+    Функция получения первого числа текущего месяца по UTC:
+    время авторизаций хранится в UTC, и границы секций должны с ним совпадать
+    '''
+
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def add_months(
+    month: date,
+    months: int
+) -> date:
+    '''
+    Функция сдвига первого числа месяца на заданное число месяцев
+
+    :param month: первое число месяца
+    :param months: число месяцев, может быть отрицательным
+    '''
+
+    index = month.year * 12 + month.month - 1 + months
+
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(
+    month: date
+) -> str:
+    return f'{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}'
+
+
+async def get_partitions(
+    connection: AsyncConnection,
+    detach_pending: bool = False
+) -> dict[str, date]:
+    '''
+    Функция получения помесячных секций истории авторизаций
+
+    :param detach_pending: вернуть только секции, отсоединение которых было прервано
+    '''
+
+    result = await connection.execute(
+        text(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = CAST(:parent AS regclass) '
+            'AND i.inhdetachpending = :detach_pending'
+        ),
+        {
+            'parent': PARENT_TABLE,
+            'detach_pending': detach_pending
+        }
+    )
+
+    partitions = {}
+    for name in result.scalars():
+        match = PARTITION_NAME.match(name)
+        if match is not None:
+            partitions[name] = date(int(match[1]), int(match[2]), 1)
+
+    return partitions
+
+
+async def create_partitions(
+    connection: AsyncConnection,
+    start: date,
+    months: int
+) -> list[str]:
+    '''
+    Функция создания отсутствующих помесячных секций
+
+    :param start: первое число первого месяца
+    :param months: число создаваемых месяцев
+    :return: имена созданных секций
+    '''
+
+    existing = await get_partitions(connection)
+    created = []
+
+    for offset in range(months):
+        month = add_months(start, offset)
+        name = get_partition_name(month)
+        if name in existing:
+            continue
+
+        await connection.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+        created.append(name)
+
+    return created
+
+
+async def remove_partitions(
+    connection: AsyncConnection,
+    before: date,
+    archive_schema: str | None = None
+) -> list[str]:
+    '''
+    Функция отсоединения секций, полностью предшествующих указанному месяцу.
+    Отсоединенные секции переносятся в схему архива либо удаляются.
+    Соединение должно работать в режиме autocommit
+
+    :param before: первое число первого сохраняемого месяца
+    :param archive_schema: схема архива, при отсутствии секции удаляются
+    :return: имена отсоединенных секций
+    '''
+
+    partitions = await get_partitions(connection)
+    pending = await get_partitions(
+        connection=connection,
+        detach_pending=True
+    )
+    removed = []
+
+    if archive_schema is not None:
+        await connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+
+    for name, month in sorted({**partitions, **pending}.items(), key=lambda item: item[1]):
+        if month >= before:
+            continue
+
+        if name in pending:
+            # Завершение отсоединения, прерванного при предыдущем запуске
+            await connection.execute(text(
+                f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}" FINALIZE'
+            ))
+        else:
+            # Отсоединение без блокировки записи в родительскую таблицу
+            await connection.execute(text(
+                f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}" CONCURRENTLY'
+            ))
+
+        if archive_schema is not None:
+            await connection.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+        else:
+            await connection.execute(text(f'DROP TABLE "{name}"'))
+
+        removed.append(name)
+
+    return removed
+
+
+async def maintain_partitions(
+    connection: AsyncConnection,
+    months_ahead: int,
+    retention_months: int,
+    archive_schema: str | None = None
+) -> tuple[list[str], list[str]] | None:
+    '''
+    Функция создания секций на текущий и следующие месяцы и отсоединения секций
+    старше срока хранения. Выполняется не более чем одним процессом одновременно.
+    Соединение должно работать в режиме autocommit
+
+    :param months_ahead: число месяцев вперед, для которых создаются секции
+    :param retention_months: число полных месяцев, за которые хранится история
+    :param archive_schema: схема архива, при отсутствии секции удаляются
+    :return: имена созданных и отсоединенных секций либо None, если обслуживание
+        уже выполняется другим процессом
+    '''
+
+    locked = await connection.scalar(
+        text('SELECT pg_try_advisory_lock(hashtext(:name))'),
+        {
+            'name': MAINTENANCE_LOCK
+        }
+    )
+    if not locked:
+        return None
+
+    try:
+        current_month = get_current_month()
+
+        created = await create_partitions(
+            connection=connection,
+            start=current_month,
+            months=months_ahead + 1
+        )
+        removed = await remove_partitions(
+            connection=connection,
+            before=add_months(current_month, -retention_months),
+            archive_schema=archive_schema
+        )
+    finally:
+        await connection.execute(
+            text('SELECT pg_advisory_unlock(hashtext(:name))'),
+            {
+                'name': MAINTENANCE_LOCK
+            }
+        )
+
+    return created, removed
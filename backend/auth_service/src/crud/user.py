@@ -1,6 +1,11 @@
+import uuid
+
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dependencies.password import PasswordHasher
+from dependencies.postgres import LazySession
 from models.models import User
 
 
@@ -25,59 +30,107 @@ async def check_email(
     return False
 
 
-async def check_password(
+async def create_user(
     db_session: AsyncSession,
     email: str,
+    password_hash: str,
+    first_name: str,
+    last_name: str
+) -> uuid.UUID | None:
+    '''
+    Функция для создания пользователя одним запросом. Если адрес почты уже занят,
+    в том числе параллельной регистрацией, пользователь не создается
+
+    :param email: адрес почты
+    :param password_hash: хеш пароля
+    :param first_name: имя
+    :param last_name: фамилия
+    :return: ID созданного пользователя либо None, если адрес почты занят
+    '''
+
+    result = await db_session.execute(
+        insert(User)
+        .values(
+            email=email,
+            password=password_hash,
+            first_name=first_name,
+            last_name=last_name
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id)
+    )
+    await db_session.commit()
+
+    return result.scalar_one_or_none()
+
+
+async def authenticate_user(
+    db_session: LazySession,
+    password_session: PasswordHasher,
+    email: str,
     password: str
-) -> bool:
+) -> uuid.UUID | None:
     '''
-    Функция для проверки введенного клиентом пароля
+    Функция для проверки введенного клиентом пароля. ID и хеш пароля
+    пользователя получаются одним запросом, соединение с БД освобождается
+    до проверки пароля
 
+    :param password_session: пул хеширования паролей
     :param email: введенный email
     :param password: введенный пароль
+    :return: ID пользователя при совпадении пароля
     '''
 
-    result = await db_session.execute(
-        select(User)
-        .where(User.email == email)
-    )
+    async with db_session.acquire() as session:
+        result = await session.execute(
+            select(User.id, User.password)
+            .where(User.email == email)
+        )
 
-    user = result.scalars().first()
-    if user:
-        return user.check_password(password)
+        user = result.first()
 
-    return False
+    if user and await password_session.check_password(
+        password_hash=user.password,
+        password=password
+    ):
+        return user.id
+
+    return None
 
 
-async def get_user_id(
+async def get_user_ids(
     db_session: AsyncSession,
-    email: str
-) -> str:
+    emails: list[str]
+) -> dict[str, str]:
     '''
-    Функция для получения id пользователя по email
+    Функция для получения id нескольких пользователей по email одним запросом
 
-    :param email: искомый email
+    :param emails: искомые email
+    :return: соответствие email и id найденных пользователей
     '''
 
+    if not emails:
+        return {}
+
     result = await db_session.execute(
-        select(User.id)
-        .where(User.email == email)
+        select(User.email, User.id)
+        .where(User.email.in_(set(emails)))
     )
 
-    return result.scalars().first()
+    return {email: user_id for email, user_id in result.all()}
 
 
 async def update_user_credentials(
     db_session: AsyncSession,
     email: str,
-    new_password: str,
+    new_password_hash: str,
     new_refresh_token: str
 ) -> None:
     '''
     Функция для обновления аутентификационных данных пользователя
 
     :param email: email обновляемого пользователя
-    :param new_password: новый пароль
+    :param new_password_hash: хеш нового пароля
     :param new_refresh_token: новый refresh_token
     '''
 
@@ -87,7 +140,7 @@ async def update_user_credentials(
     )
 
     user = result.scalars().first()
-    user.set_updated_password(new_password)
+    user.password = new_password_hash
     user.refresh_token = new_refresh_token
 
     await db_session.commit()
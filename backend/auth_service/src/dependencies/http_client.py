@@ -0,0 +1,42 @@
+import aiohttp
+
+http_session: aiohttp.ClientSession | None = None
+
+
+def get_http_session(
+    limit: int,
+    limit_per_host: int,
+    dns_cache_ttl: int,
+    keepalive_timeout: float,
+    connect_timeout: float,
+    request_timeout: float
+) -> aiohttp.ClientSession:
+    '''
+    Функция создания общего для процесса HTTP-клиента внешних сервисов авторизации.
+    Соединения с провайдерами переиспользуются между запросами
+
+    :param limit: максимальное число соединений
+    :param limit_per_host: максимальное число соединений с одним хостом
+    :param dns_cache_ttl: время кеширования DNS-записей, секунд
+    :param keepalive_timeout: время простоя соединения до закрытия, секунд
+    :param connect_timeout: таймаут установки соединения, секунд
+    :param request_timeout: общий таймаут запроса, секунд
+    '''
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=dns_cache_ttl,
+        use_dns_cache=True,
+        keepalive_timeout=keepalive_timeout,
+        enable_cleanup_closed=True
+    )
+
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=request_timeout,
+            connect=connect_timeout
+        ),
+        raise_for_status=False
+    )
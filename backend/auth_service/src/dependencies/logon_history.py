@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.metrics import (LOGON_HISTORY_DROPPED, LOGON_HISTORY_FLUSH_LATENCY,
+                          LOGON_HISTORY_QUEUE_DEPTH)
+from models.models import LogonHistory
+
+logger = logging.getLogger(__name__)
+
+
+class LogonHistoryWriter:
+    '''
+    Класс, накапливающий записи истории авторизаций в памяти и записывающий их
+    в БД пакетами по достижении размера пакета или по истечении интервала
+    '''
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow_policy: str
+    ):
+        self.sessionmaker = sessionmaker
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._task: asyncio.Task | None = None
+
+    async def add(
+        self,
+        ip: str,
+        user_agent: str | None,
+        user_id: str
+    ) -> None:
+        '''
+        Функция постановки записи истории авторизаций в очередь.
+        При переполнении очереди поведение определяется политикой переполнения
+
+        :param ip: IP-адрес пользователя
+        :param user_agent: User-Agent пользователя
+        :param user_id: ID пользователя
+        '''
+
+        record = {
+            'ip': ip,
+            'user_agent': user_agent,
+            'user_id': user_id,
+            'logon_time': datetime.utcnow()
+        }
+
+        if self.overflow_policy == 'block':
+            await self._queue.put(record)
+        elif self._queue.full():
+            LOGON_HISTORY_DROPPED.labels('overflow').inc()
+            if self.overflow_policy == 'drop_newest':
+                return
+
+            self._queue.get_nowait()
+            self._queue.put_nowait(record)
+        else:
+            self._queue.put_nowait(record)
+
+        LOGON_HISTORY_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def _collect(self) -> list[dict]:
+        '''Функция набора пакета записей из очереди'''
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        batch = []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            timeout = deadline - loop.time()
+            if timeout <= 0 or self._closed:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        LOGON_HISTORY_QUEUE_DEPTH.set(self._queue.qsize())
+
+        return batch
+
+    async def _flush(
+        self,
+        batch: list[dict]
+    ) -> None:
+        '''
+        Функция записи пакета в БД одним многострочным INSERT
+
+        :param batch: записи истории авторизаций
+        '''
+
+        start = time.perf_counter()
+
+        try:
+            async with self.sessionmaker() as db_session:
+                await db_session.execute(insert(LogonHistory), batch)
+                await db_session.commit()
+        except Exception:
+            logger.exception('Failed to write %d logon history records', len(batch))
+            LOGON_HISTORY_DROPPED.labels('error').inc(len(batch))
+        finally:
+            LOGON_HISTORY_FLUSH_LATENCY.observe(time.perf_counter() - start)
+
+    async def run(self) -> None:
+        '''Функция фоновой записи очереди в БД до закрытия и опустошения очереди'''
+
+        while not (self._closed and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                await self._flush(batch)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self.run())
+
+    async def close(
+        self,
+        timeout: float
+    ) -> None:
+        '''
+        Функция остановки записи с сохранением накопленных записей
+
+        :param timeout: максимальное время ожидания записи очереди, секунд
+        '''
+
+        self._closed = True
+        if self._task is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                'Logon history drain timed out, %d records lost',
+                self._queue.qsize()
+            )
+            LOGON_HISTORY_DROPPED.labels('shutdown').inc(self._queue.qsize())
+
+
+logon_history_writer: LogonHistoryWriter | None = None
+
+
+def get_logon_history_writer(
+    sessionmaker: async_sessionmaker,
+    max_queue_size: int,
+    batch_size: int,
+    flush_interval: float,
+    overflow_policy: str
+) -> LogonHistoryWriter:
+    '''
+    Функция создания буфера записи истории авторизаций
+
+    :param sessionmaker: фабрика сессий БД
+    :param max_queue_size: максимальное число записей в очереди
+    :param batch_size: максимальное число записей в одном INSERT
+    :param flush_interval: максимальное время ожидания пакета, секунд
+    :param overflow_policy: поведение при переполнении: drop_newest, drop_oldest или block
+    '''
+
+    return LogonHistoryWriter(
+        sessionmaker=sessionmaker,
+        max_queue_size=max_queue_size,
+        batch_size=batch_size,
+        flush_interval=flush_interval,
+        overflow_policy=overflow_policy
+    )
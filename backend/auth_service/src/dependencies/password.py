@@ -0,0 +1,140 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+
+from fastapi import HTTPException, status
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from core.metrics import (PASSWORD_HASH_LATENCY, PASSWORD_HASH_QUEUE_DEPTH,
+                          PASSWORD_HASH_REJECTED)
+
+
+class PasswordHasher:
+    '''
+    Класс, выполняющий хеширование и проверку паролей в отдельном пуле,
+    не блокируя цикл событий
+    '''
+
+    overload_exception = HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail='Service is overloaded, try again later',
+        headers={
+            'Retry-After': '1'
+        }
+    )
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_queue_size: int
+    ):
+        self.executor = executor
+        self.max_queue_size = max_queue_size
+        self._pending = 0
+
+    async def _run(
+        self,
+        operation: str,
+        func,
+        *args
+    ):
+        '''
+        Функция выполнения операции в пуле с ограничением очереди
+
+        :param operation: название операции для метрик
+        :param func: выполняемая функция
+        '''
+
+        if self._pending >= self.max_queue_size:
+            PASSWORD_HASH_REJECTED.labels(operation).inc()
+            raise self.overload_exception
+
+        self._pending += 1
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        start = time.perf_counter()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                func,
+                *args
+            )
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+            PASSWORD_HASH_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+    async def hash_password(
+        self,
+        password: str
+    ) -> str:
+        '''
+        Функция получения хеша пароля
+
+        :param password: пароль
+        '''
+
+        return await self._run(
+            'hash',
+            generate_password_hash,
+            password
+        )
+
+    async def check_password(
+        self,
+        password_hash: str,
+        password: str
+    ) -> bool:
+        '''
+        Функция проверки пароля по его хешу
+
+        :param password_hash: сохраненный хеш пароля
+        :param password: проверяемый пароль
+        '''
+
+        return await self._run(
+            'check',
+            check_password_hash,
+            password_hash,
+            password
+        )
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+password_hasher: PasswordHasher | None = None
+
+
+def get_password_hasher(
+    executor: str,
+    max_workers: int,
+    max_queue_size: int
+) -> PasswordHasher:
+    '''
+    Функция создания пула хеширования паролей
+
+    :param executor: тип пула: thread или process
+    :param max_workers: число исполнителей в пуле
+    :param max_queue_size: максимальное число ожидающих и выполняемых операций
+    '''
+
+    if executor == 'process':
+        # Процесс уже запустил потоки gRPC и OpenTelemetry, поэтому fork
+        # может унаследовать захваченные ими блокировки
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    else:
+        pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='password_hasher'
+        )
+
+    return PasswordHasher(
+        executor=pool,
+        max_queue_size=max_queue_size
+    )
@@ -1,24 +1,146 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
+                                    async_sessionmaker, create_async_engine)
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.metrics import (POSTGRES_POOL_CHECKED_OUT, POSTGRES_POOL_CHECKOUT_WAIT,
+                          POSTGRES_QUERY_LATENCY)
 
 Base = declarative_base()
 
+engine: AsyncEngine | None = None
+async_session: async_sessionmaker | None = None
 
-def get_sessionmaker(
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    '''Пул соединений, фиксирующий время ожидания свободного соединения'''
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POSTGRES_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _before_cursor_execute(
+    conn,
+    cursor,
+    statement,
+    parameters,
+    context,
+    executemany
+) -> None:
+    context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn,
+    cursor,
+    statement,
+    parameters,
+    context,
+    executemany
+) -> None:
+    POSTGRES_QUERY_LATENCY.labels(
+        (statement.split(None, 1) or ['OTHER'])[0].upper()
+    ).observe(time.perf_counter() - context.query_start)
+
+
+def get_engine(
     user: str,
     password: str,
     host: str,
     port: str,
-    dbname: str
-) -> sessionmaker:
+    dbname: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: float,
+    pool_pre_ping: bool,
+    pool_recycle: int,
+    statement_cache_size: int
+) -> AsyncEngine:
+    '''
+    Функция создания общего для процесса движка БД с пулом соединений
+
+    :param pool_size: число постоянно открытых соединений
+    :param max_overflow: число соединений сверх pool_size
+    :param pool_timeout: время ожидания свободного соединения, секунд
+    :param pool_pre_ping: проверять соединение перед выдачей из пула
+    :param pool_recycle: время жизни соединения, секунд
+    :param statement_cache_size: размер кеша подготовленных выражений на соединение
+    '''
+
     engine = create_async_engine(
         f'postgresql+asyncpg://{user}:{password}@{host}:{port}/{dbname}',
         echo=False,
-        future=True
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_pre_ping=pool_pre_ping,
+        pool_recycle=pool_recycle,
+        connect_args={
+            'prepared_statement_cache_size': statement_cache_size
+        }
     )
 
-    return sessionmaker(
+    event.listen(
+        engine.sync_engine,
+        'checkout',
+        lambda *args: POSTGRES_POOL_CHECKED_OUT.inc()
+    )
+    event.listen(
+        engine.sync_engine,
+        'checkin',
+        lambda *args: POSTGRES_POOL_CHECKED_OUT.dec()
+    )
+    event.listen(
+        engine.sync_engine,
+        'before_cursor_execute',
+        _before_cursor_execute
+    )
+    event.listen(
+        engine.sync_engine,
+        'after_cursor_execute',
+        _after_cursor_execute
+    )
+
+    return engine
+
+
+def get_sessionmaker(
+    engine: AsyncEngine
+) -> async_sessionmaker:
+    return async_sessionmaker(
         engine,
         class_=AsyncSession,
         expire_on_commit=False
     )
+
+
+class LazySession:
+    '''
+    Класс доступа к БД, создающий сессию только при обращении к БД.
+    Соединение из пула удерживается лишь на время блока acquire,
+    а не на все время обработки запроса
+    '''
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker
+    ):
+        self.sessionmaker = sessionmaker
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AsyncSession]:
+        '''Функция получения сессии БД, закрываемой по завершении блока'''
+
+        async with self.sessionmaker() as session:
+            yield session
@@ -0,0 +1,138 @@
+import logging
+import math
+
+from fastapi import HTTPException, status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.metrics import RATE_LIMIT_CHECKS
+
+logger = logging.getLogger(__name__)
+
+# GCRA по нескольким ключам за один вызов: запрос пропускается, только если его
+# допускают все ключи, и лишь тогда для них сдвигается теоретическое время прибытия.
+# ARGV содержит пары (интервал между запросами, допустимый запас) в миллисекундах
+GCRA_SCRIPT = '''
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local retry_after = 0
+local tats = {}
+
+for i, key in ipairs(KEYS) do
+    local emission = tonumber(ARGV[i * 2 - 1])
+    local tolerance = tonumber(ARGV[i * 2])
+    local tat = math.max(tonumber(redis.call('GET', key) or now), now)
+
+    tats[i] = tat + emission
+    retry_after = math.max(retry_after, tats[i] - tolerance - now)
+end
+
+if retry_after > 0 then
+    return retry_after
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, tats[i], 'PX', tats[i] - now)
+end
+
+return 0
+'''
+
+
+class RateLimiter:
+    '''
+    Класс ограничения частоты запросов по IP-адресу и учетной записи.
+    Проверка всех ограничений маршрута выполняется одним вызовом скрипта Redis;
+    при недоступности Redis запросы пропускаются
+    '''
+
+    def __init__(
+        self,
+        redis_session: Redis,
+        enabled: bool,
+        period: int,
+        limits: dict[str, int]
+    ):
+        self.enabled = enabled
+        self.period = period
+        self.limits = limits
+        self._script = redis_session.register_script(GCRA_SCRIPT)
+
+    def _get_limit_exception(
+        self,
+        retry_after: int
+    ) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Too many requests, try again later',
+            headers={
+                'Retry-After': str(max(math.ceil(retry_after / 1000), 1))
+            }
+        )
+
+    async def check(
+        self,
+        route: str,
+        ip: str,
+        account: str | None = None
+    ) -> None:
+        '''
+        Функция проверки ограничений маршрута. Ограничения задаются
+        настройками {route}_ip и {route}_account, значение 0 отключает ограничение
+
+        :param route: название маршрута
+        :param ip: IP-адрес клиента
+        :param account: email учетной записи, если он известен до обработки запроса
+        '''
+
+        if not self.enabled:
+            return
+
+        keys = []
+        args = []
+        for scope, value in (('ip', ip), ('account', account)):
+            limit = self.limits.get(f'{route}_{scope}', 0)
+            if not limit or value is None:
+                continue
+
+            emission = max(self.period * 1000 // limit, 1)
+            keys.append(f'rate_limit:{route}:{scope}:{value.lower()}')
+            args += [emission, emission * limit]
+
+        if not keys:
+            return
+
+        try:
+            retry_after = await self._script(
+                keys=keys,
+                args=args
+            )
+        except RedisError:
+            logger.warning('Rate limit check failed, letting request through', exc_info=True)
+            RATE_LIMIT_CHECKS.labels(route, 'error').inc()
+            return
+
+        if retry_after > 0:
+            RATE_LIMIT_CHECKS.labels(route, 'limited').inc()
+            raise self._get_limit_exception(
+                retry_after=retry_after
+            )
+
+        RATE_LIMIT_CHECKS.labels(route, 'allowed').inc()
+
+
+rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter(
+    redis_session: Redis,
+    enabled: bool,
+    period: int,
+    limits: dict[str, int]
+) -> RateLimiter:
+    return RateLimiter(
+        redis_session=redis_session,
+        enabled=enabled,
+        period=period,
+        limits=limits
+    )
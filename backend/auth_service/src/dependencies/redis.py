@@ -1,13 +1,112 @@
-from redis.asyncio import Redis
+import time
 
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
 
-def get_redis(
+from core.metrics import REDIS_COMMAND_LATENCY, REDIS_POOL_IN_USE
+
+redis_session: Redis | None = None
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    '''Пул соединений с Redis, фиксирующий число выданных соединений'''
+
+    async def get_connection(
+        self,
+        command_name,
+        *keys,
+        **options
+    ):
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        finally:
+            # свободные места пула хранятся в очереди, поэтому занятые вычисляются по ее размеру
+            REDIS_POOL_IN_USE.set(self.max_connections - self.pool.qsize())
+
+    async def release(
+        self,
+        connection
+    ) -> None:
+        await super().release(connection)
+        REDIS_POOL_IN_USE.set(self.max_connections - self.pool.qsize())
+
+
+class InstrumentedPipeline(Pipeline):
+    '''Конвейер команд Redis, фиксирующий длительность выполнения всего конвейера'''
+
+    async def execute(
+        self,
+        raise_on_error: bool = True
+    ):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_LATENCY.labels('PIPELINE').observe(time.perf_counter() - start)
+
+
+class InstrumentedRedis(Redis):
+    '''Клиент Redis, фиксирующий длительность команд и конвейеров'''
+
+    def pipeline(
+        self,
+        transaction: bool = True,
+        shard_hint: str | None = None
+    ) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint
+        )
+
+    async def execute_command(
+        self,
+        *args,
+        **options
+    ):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(args[0]).observe(time.perf_counter() - start)
+
+
+def get_redis_pool(
     host: str,
-    port: int
-) -> Redis:
-    return Redis(
+    port: int,
+    max_connections: int,
+    pool_timeout: float,
+    health_check_interval: int,
+    socket_timeout: float,
+    socket_connect_timeout: float
+) -> InstrumentedConnectionPool:
+    '''
+    Функция создания общего для процесса пула соединений с Redis
+
+    :param max_connections: максимальное число соединений в пуле
+    :param pool_timeout: время ожидания свободного соединения, секунд
+    :param health_check_interval: интервал проверки простаивающих соединений, секунд
+    :param socket_timeout: таймаут операций с сокетом, секунд
+    :param socket_connect_timeout: таймаут установки соединения, секунд
+    '''
+
+    return InstrumentedConnectionPool(
         host=host,
         port=port,
         db=0,
-        decode_responses=True
+        decode_responses=True,
+        max_connections=max_connections,
+        timeout=pool_timeout,
+        health_check_interval=health_check_interval,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_connect_timeout
+    )
+
+
+def get_redis(
+    connection_pool: InstrumentedConnectionPool
+) -> InstrumentedRedis:
+    return InstrumentedRedis(
+        connection_pool=connection_pool
     )
@@ -1,2 +1,3 @@
 alembic upgrade head
-python3 main.py $AUTH_API_PORT
\ No newline at end of file
+python3 maintenance.py create-logon-history-partitions
+exec python3 launcher.py
\ No newline at end of file
@@ -0,0 +1,322 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+from multiprocessing.synchronize import Event
+from typing import Optional
+
+import typer
+import uvicorn
+from prometheus_client import multiprocess
+
+from core.config import auth_api_settings, metrics_settings
+from rpc.authenticator_server.worker import serve
+
+app = typer.Typer(help='Многопроцессный запуск сервиса авторизации')
+
+logger = logging.getLogger('launcher')
+
+
+class ReadyServer(uvicorn.Server):
+    '''HTTP-сервер, сообщающий супервизору о завершении запуска'''
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        ready: Event
+    ):
+        super().__init__(config)
+        self.ready = ready
+
+    async def startup(
+        self,
+        sockets=None
+    ) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            self.ready.set()
+
+
+def run_http_worker(
+    port: int,
+    ready: Event
+) -> None:
+    '''
+    Функция HTTP-процесса. Каждый процесс открывает собственный сокет с SO_REUSEPORT,
+    распределение соединений между процессами выполняет ядро
+
+    :param port: порт HTTP-сервера
+    :param ready: событие готовности процесса
+    '''
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(('0.0.0.0', port))
+
+    server = ReadyServer(
+        config=uvicorn.Config(
+            'main:app',
+            forwarded_allow_ips=auth_api_settings.forwarded_allow_ips,
+            timeout_graceful_shutdown=int(auth_api_settings.shutdown_timeout)
+        ),
+        ready=ready
+    )
+    server.run(sockets=[sock])
+
+
+def run_grpc_worker(
+    port: int,
+    ready: Event
+) -> None:
+    '''
+    Функция gRPC-процесса
+
+    :param port: порт gRPC-сервера
+    :param ready: событие готовности процесса
+    '''
+
+    asyncio.run(serve(
+        port=port,
+        on_ready=ready.set
+    ))
+
+
+class Supervisor:
+    '''
+    Класс, запускающий HTTP- и gRPC-процессы, перезапускающий аварийно завершившиеся
+    и останавливающий все процессы по SIGTERM или SIGINT.
+    Перезапуск выполняется с экспоненциальной задержкой; если процесс подряд
+    завершается, не успев запуститься, супервизор останавливается с ошибкой
+    '''
+
+    def __init__(
+        self,
+        http_workers: int,
+        grpc_workers: int,
+        http_port: int,
+        grpc_port: int,
+        shutdown_timeout: float,
+        restart_base_delay: float,
+        restart_max_delay: float,
+        max_start_failures: int,
+        ready_file: str | None,
+        metrics_dir: str | None
+    ):
+        self.context = multiprocessing.get_context('spawn')
+        self.specs = (
+            [(run_http_worker, http_port)] * http_workers
+            + [(run_grpc_worker, grpc_port)] * grpc_workers
+        )
+        self.shutdown_timeout = shutdown_timeout
+        self.restart_base_delay = restart_base_delay
+        self.restart_max_delay = restart_max_delay
+        self.max_start_failures = max_start_failures
+        self.ready_file = ready_file
+        self.metrics_dir = metrics_dir
+        self.workers: list[tuple[multiprocessing.Process, Event]] = []
+        self.start_failures: list[int] = []
+        self.restart_at: list[float | None] = []
+        self.should_exit = False
+        self.exit_code = 0
+
+    def _spawn(
+        self,
+        index: int
+    ) -> None:
+        target, port = self.specs[index]
+        ready = self.context.Event()
+        process = self.context.Process(
+            target=target,
+            args=(port, ready),
+            name=f'{target.__name__}-{index}'
+        )
+        process.start()
+        self.workers[index] = (process, ready)
+        self.restart_at[index] = None
+
+    def _schedule_restart(
+        self,
+        index: int
+    ) -> None:
+        '''
+        Функция планирования перезапуска завершившегося процесса.
+        Счетчик неудачных запусков сбрасывается, если процесс успел стать готовым
+
+        :param index: номер процесса
+        '''
+
+        process, ready = self.workers[index]
+        if self.metrics_dir is not None:
+            multiprocess.mark_process_dead(process.pid)
+
+        if ready.is_set():
+            self.start_failures[index] = 0
+        else:
+            self.start_failures[index] += 1
+
+        if self.start_failures[index] >= self.max_start_failures:
+            logger.error(
+                'Worker %s failed to start %d times in a row (exit code %s), giving up',
+                process.name,
+                self.start_failures[index],
+                process.exitcode
+            )
+            self.should_exit = True
+            self.exit_code = 1
+            return
+
+        delay = min(
+            self.restart_base_delay * 2 ** self.start_failures[index],
+            self.restart_max_delay
+        )
+        logger.error(
+            'Worker %s exited with code %s, restarting in %.1f s',
+            process.name,
+            process.exitcode,
+            delay
+        )
+        self.restart_at[index] = time.monotonic() + delay
+
+    def _set_ready(
+        self,
+        ready: bool
+    ) -> None:
+        if self.ready_file is None:
+            return
+
+        if ready:
+            with open(self.ready_file, 'w') as file:
+                file.write(str(os.getpid()))
+        elif os.path.exists(self.ready_file):
+            os.remove(self.ready_file)
+
+    def _prepare_metrics_dir(self) -> None:
+        '''
+        Функция подготовки каталога метрик: процессы записывают значения
+        в собственные файлы, а /metrics любого HTTP-процесса агрегирует их
+        '''
+
+        if self.metrics_dir is None:
+            return
+
+        shutil.rmtree(self.metrics_dir, ignore_errors=True)
+        os.makedirs(self.metrics_dir)
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = self.metrics_dir
+
+    def _handle_exit(
+        self,
+        signum,
+        frame
+    ) -> None:
+        self.should_exit = True
+
+    def _stop(self) -> None:
+        '''Функция остановки процессов с ожиданием завершения обработки запросов'''
+
+        self._set_ready(False)
+
+        for process, _ in self.workers:
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process, _ in self.workers:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning('Worker %s did not stop in time, killing', process.name)
+                process.kill()
+                process.join()
+
+    def run(self) -> int:
+        # Дочерние процессы получают настройки из окружения при импорте
+        os.environ['AUTH_API_GRPC_EMBEDDED'] = 'false'
+        self._prepare_metrics_dir()
+
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+
+        self.workers = [None] * len(self.specs)
+        self.start_failures = [0] * len(self.specs)
+        self.restart_at = [None] * len(self.specs)
+        for index in range(len(self.specs)):
+            self._spawn(index)
+
+        is_ready = False
+        while not self.should_exit:
+            wait(
+                [
+                    process.sentinel
+                    for index, (process, _) in enumerate(self.workers)
+                    if self.restart_at[index] is None
+                ],
+                timeout=0.5
+            )
+            if self.should_exit:
+                break
+
+            now = time.monotonic()
+            for index, (process, _) in enumerate(self.workers):
+                if self.restart_at[index] is not None:
+                    if now >= self.restart_at[index]:
+                        self._spawn(index)
+                elif not process.is_alive():
+                    self._schedule_restart(index)
+
+            all_ready = all(
+                process.is_alive() and ready.is_set()
+                for process, ready in self.workers
+            )
+            if all_ready != is_ready:
+                is_ready = all_ready
+                self._set_ready(is_ready)
+                logger.info('Workers are %s', 'ready' if is_ready else 'not ready')
+
+        self._stop()
+
+        return self.exit_code
+
+
+@app.command()
+def run(
+    http_workers: int = typer.Option(
+        auth_api_settings.http_workers,
+        help='Число HTTP-процессов'
+    ),
+    grpc_workers: int = typer.Option(
+        auth_api_settings.grpc_workers,
+        help='Число gRPC-процессов'
+    ),
+    ready_file: Optional[str] = typer.Option(
+        auth_api_settings.ready_file,
+        help='Файл, существующий, пока все процессы готовы принимать запросы'
+    )
+):
+    '''Запуск HTTP- и gRPC-процессов сервиса авторизации'''
+
+    logging.basicConfig(level=logging.INFO)
+
+    exit_code = Supervisor(
+        http_workers=http_workers,
+        grpc_workers=grpc_workers,
+        http_port=auth_api_settings.port,
+        grpc_port=auth_api_settings.authenticator_port,
+        shutdown_timeout=auth_api_settings.shutdown_timeout,
+        restart_base_delay=auth_api_settings.worker_restart_base_delay,
+        restart_max_delay=auth_api_settings.worker_restart_max_delay,
+        max_start_failures=auth_api_settings.worker_max_start_failures,
+        ready_file=ready_file,
+        metrics_dir=metrics_settings.multiproc_dir
+    ).run()
+
+    if exit_code:
+        raise typer.Exit(exit_code)
+
+
+if __name__ == '__main__':
+    app()
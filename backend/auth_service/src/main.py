@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import uuid
 from contextlib import asynccontextmanager
@@ -6,44 +7,88 @@ import uvicorn
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
-from fastapi_limiter import FastAPILimiter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
-from core.config import (auth_api_settings, jaeger_settings, logstash_settings,
-                         postgres_settings, redis_settings)
+from core.config import (auth_api_settings, jaeger_settings,
+                         logon_history_settings, logstash_settings,
+                         metrics_settings, oauth_client_settings,
+                         password_settings, rate_limit_settings)
+from core.lifecycle import close_storage, open_storage
 from core.logger import init_uvicorn_logger
+from core.monitoring import MetricsMiddleware, monitor_event_loop_lag
 from core.tracer import configure_tracer, jaeger_middleware
-from dependencies import postgres, redis
-from routers import account, signin, signup
+from dependencies import (http_client, logon_history, password, postgres,
+                          rate_limit, redis)
+from routers import account, jwks, metrics, signin, signup
 from rpc.authenticator_server.server import get_authenticator_server
-from services import oauth
+from services.partitions import run_partition_maintenance
 
 
 @asynccontextmanager
 async def lifespan(
     app: FastAPI
 ):
-    redis_session = await redis.get_redis(
-        host=redis_settings.host,
-        port=redis_settings.port
+    revocation_filter_task = await open_storage()
+
+    event_loop_lag_task = asyncio.create_task(
+        monitor_event_loop_lag(
+            interval=metrics_settings.event_loop_lag_interval
+        )
     )
 
-    postgres_session = postgres.get_sessionmaker(
-        user=postgres_settings.user,
-        password=postgres_settings.password,
-        host=postgres_settings.host,
-        port=postgres_settings.port,
-        dbname=postgres_settings.dbname,
-    )()
+    # Секции создаются заранее, иначе вставка истории авторизаций в новом месяце завершится ошибкой
+    partition_maintenance_task = None
+    if logon_history_settings.maintenance_interval > 0:
+        partition_maintenance_task = asyncio.create_task(
+            run_partition_maintenance(
+                engine=postgres.engine,
+                interval=logon_history_settings.maintenance_interval,
+                months_ahead=logon_history_settings.partitions_ahead,
+                retention_months=logon_history_settings.retention_months,
+                archive_schema=logon_history_settings.archive_schema
+            )
+        )
+
+    logon_history.logon_history_writer = logon_history.get_logon_history_writer(
+        sessionmaker=postgres.async_session,
+        max_queue_size=logon_history_settings.max_queue_size,
+        batch_size=logon_history_settings.batch_size,
+        flush_interval=logon_history_settings.flush_interval,
+        overflow_policy=logon_history_settings.overflow_policy
+    )
+    logon_history.logon_history_writer.start()
 
-    aiohttp_session = oauth.get_aiohttp_session()
+    password.password_hasher = password.get_password_hasher(
+        executor=password_settings.executor,
+        max_workers=password_settings.max_workers,
+        max_queue_size=password_settings.max_queue_size
+    )
 
-    authenticator_server = get_authenticator_server(
-        port=auth_api_settings.authenticator_port
+    http_client.http_session = http_client.get_http_session(
+        limit=oauth_client_settings.limit,
+        limit_per_host=oauth_client_settings.limit_per_host,
+        dns_cache_ttl=oauth_client_settings.dns_cache_ttl,
+        keepalive_timeout=oauth_client_settings.keepalive_timeout,
+        connect_timeout=oauth_client_settings.connect_timeout,
+        request_timeout=oauth_client_settings.request_timeout
     )
-    await authenticator_server.start()
 
-    await FastAPILimiter.init(redis_session)
+    # В многопроцессном режиме gRPC-сервер запускается в отдельных процессах
+    authenticator_server = None
+    if auth_api_settings.grpc_embedded:
+        authenticator_server = get_authenticator_server(
+            port=auth_api_settings.authenticator_port
+        )
+        await authenticator_server.start()
+
+    rate_limit.rate_limiter = rate_limit.get_rate_limiter(
+        redis_session=redis.redis_session,
+        enabled=rate_limit_settings.enabled,
+        period=rate_limit_settings.period,
+        limits=rate_limit_settings.model_dump(
+            exclude={'enabled', 'period'}
+        )
+    )
 
     init_uvicorn_logger(
         host=logstash_settings.host,
@@ -52,17 +97,27 @@ async def lifespan(
 
     yield
 
-    await redis_session.close()
+    if authenticator_server is not None:
+        await authenticator_server.stop(
+            grace=5
+        )
 
-    await postgres_session.close()
+    await logon_history.logon_history_writer.close(
+        timeout=logon_history_settings.drain_timeout
+    )
 
-    await aiohttp_session.aclose()
+    password.password_hasher.shutdown()
 
-    await authenticator_server.wait_for_termination(
-        timeout=5
-    )
+    await http_client.http_session.close()
+
+    event_loop_lag_task.cancel()
+
+    if partition_maintenance_task is not None:
+        partition_maintenance_task.cancel()
 
-    await FastAPILimiter.close()
+    await close_storage(
+        revocation_filter_task=revocation_filter_task
+    )
 
 
 app = FastAPI(
@@ -84,6 +139,10 @@ if jaeger_settings.enable_tracer:
 
     app.middleware('http')(jaeger_middleware)
 
+app.add_middleware(
+    MetricsMiddleware
+)
+
 app.add_middleware(
     CorrelationIdMiddleware,
     header_name='X-Request-ID',
@@ -102,6 +161,12 @@ app.include_router(
     router=account.router,
     prefix='/api/v1/account'
 )
+app.include_router(
+    router=jwks.router
+)
+app.include_router(
+    router=metrics.router
+)
 
 FastAPIInstrumentor.instrument_app(app)
 
@@ -110,4 +175,5 @@ if __name__ == '__main__':
         'main:app',
         host='0.0.0.0',
         port=int(sys.argv[1]),
+        forwarded_allow_ips=auth_api_settings.forwarded_allow_ips
     )
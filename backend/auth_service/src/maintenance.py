@@ -0,0 +1,97 @@
+import asyncio
+from typing import Optional
+
+import typer
+
+from core.config import logon_history_settings, postgres_settings
+from crud.partitions import (add_months, create_partitions, get_current_month,
+                             remove_partitions)
+from dependencies import postgres
+
+app = typer.Typer(help='Обслуживание таблиц сервиса авторизации')
+
+
+def get_maintenance_engine():
+    return postgres.get_engine(
+        user=postgres_settings.user,
+        password=postgres_settings.password,
+        host=postgres_settings.host,
+        port=postgres_settings.port,
+        dbname=postgres_settings.dbname,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=postgres_settings.pool_timeout,
+        pool_pre_ping=False,
+        pool_recycle=postgres_settings.pool_recycle,
+        statement_cache_size=0
+    )
+
+
+async def run_create_partitions(
+    months_ahead: int
+) -> list[str]:
+    engine = get_maintenance_engine()
+
+    try:
+        async with engine.begin() as connection:
+            return await create_partitions(
+                connection=connection,
+                start=get_current_month(),
+                months=months_ahead + 1
+            )
+    finally:
+        await engine.dispose()
+
+
+async def run_apply_retention(
+    retention_months: int,
+    archive_schema: str | None
+) -> list[str]:
+    engine = get_maintenance_engine()
+
+    try:
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(
+                isolation_level='AUTOCOMMIT'
+            )
+            return await remove_partitions(
+                connection=connection,
+                before=add_months(get_current_month(), -retention_months),
+                archive_schema=archive_schema
+            )
+    finally:
+        await engine.dispose()
+
+
+@app.command()
+def create_logon_history_partitions(
+    months_ahead: int = typer.Option(
+        logon_history_settings.partitions_ahead,
+        help='Число месяцев вперед, для которых создаются секции'
+    )
+):
+    '''Создание секций истории авторизаций на текущий и следующие месяцы'''
+
+    created = asyncio.run(run_create_partitions(months_ahead))
+    typer.echo(f'Created partitions: {", ".join(created) or "none"}')
+
+
+@app.command()
+def apply_logon_history_retention(
+    retention_months: int = typer.Option(
+        logon_history_settings.retention_months,
+        help='Число полных месяцев, за которые хранится история'
+    ),
+    archive_schema: Optional[str] = typer.Option(
+        logon_history_settings.archive_schema,
+        help='Схема, в которую переносятся устаревшие секции вместо удаления'
+    )
+):
+    '''Отсоединение секций истории авторизаций старше срока хранения'''
+
+    removed = asyncio.run(run_apply_retention(retention_months, archive_schema))
+    typer.echo(f'Removed partitions: {", ".join(removed) or "none"}')
+
+
+if __name__ == '__main__':
+    app()
@@ -1,10 +1,9 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from dependencies.postgres import Base
 
@@ -45,27 +44,15 @@ class User(Base):
     def __init__(
         self,
         email: str,
-        password: str,
+        password_hash: str,
         first_name: str,
         last_name: str
     ) -> None:
         self.email = email
-        self.password = generate_password_hash(password)
+        self.password = password_hash
         self.first_name = first_name
         self.last_name = last_name
 
-    def set_updated_password(
-        self,
-        new_password: str
-    ):
-        self.password = generate_password_hash(new_password)
-
-    def check_password(
-        self,
-        password: str
-    ) -> bool:
-        return check_password_hash(self.password, password)
-
     def __repr__(self) -> str:
         return f'<User {self.login}>'
 
@@ -79,17 +66,20 @@ class LogonHistory(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        unique=True,
         nullable=False
     )
     ip = Column(String(16))
     user_agent = Column(String(255))
     logon_time = Column(
         DateTime,
-        default=datetime.utcnow())
+        primary_key=True,
+        default=datetime.utcnow,
+        server_default=func.timezone('utc', func.now()),
+        nullable=False
+    )
     created_at = Column(
         DateTime,
-        default=datetime.utcnow()
+        default=datetime.utcnow
     )
 
     user_id = Column(
@@ -101,6 +91,18 @@ class LogonHistory(Base):
         back_populates='logon_histories'
     )
 
+    __table_args__ = (
+        Index(
+            'ix_logon_histories_user_id_logon_time',
+            'user_id',
+            logon_time.desc(),
+            id.desc()
+        ),
+        {
+            'postgresql_partition_by': 'RANGE (logon_time)'
+        }
+    )
+
     def __init__(
         self,
         ip: str,
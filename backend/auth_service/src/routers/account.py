@@ -1,19 +1,26 @@
 from fastapi import (APIRouter, Depends, HTTPException, Request, Response,
                      status)
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.globals import COOKIE_PREFIX
-from crud.logon_history import get_auth_history
-from crud.user import check_password, get_user_id, update_user_credentials
+from crud.logon_history import get_auth_history, get_auth_history_after
+from crud.user import authenticate_user, update_user_credentials
+from dependencies.password import PasswordHasher
+from dependencies.postgres import LazySession
+from dependencies.rate_limit import RateLimiter
 from schemas.common import Paginator
-from schemas.logon_history import LogonHistoryModel
+from schemas.logon_history import LogonHistoryModel, LogonHistoryPageModel
 from schemas.service_message import ServiceMessageModel
 from schemas.user import ChangePasswordModel
 from services.jwt import JWTService, get_jwt_session
+from services.password import get_password_session
 from services.postgres import get_postgres_session
+from services.rate_limit import get_rate_limit_session
 from services.tracer import get_tracer_session
-from utils.tokens import create_tokens, set_tokens_to_cookies
+from services.user import UserService, get_user_session
+from utils.pagination import decode_cursor, encode_cursor
+from utils.tokens import (create_tokens, get_access_token_claims,
+                          set_tokens_to_cookies)
 from utils.wrappers import if_token_is_valid
 
 router = APIRouter()
@@ -33,15 +40,24 @@ async def refresh_tokens(
     request: Request,
     response: Response,
     jwt_session: JWTService = Depends(get_jwt_session),
-    db_session: AsyncSession = Depends(get_postgres_session)
+    db_session: LazySession = Depends(get_postgres_session),
+    user_session: UserService = Depends(get_user_session)
 ) -> ServiceMessageModel:
     old_access_token = request.cookies.get(f'{COOKIE_PREFIX}_access_token')
     old_refresh_token = request.cookies.get(f'{COOKIE_PREFIX}_refresh_token')
 
-    with tracer.start_as_current_span('Extracting user email from access token'):
-        email = jwt_session.get_data_from_token(
+    with tracer.start_as_current_span('Extracting user data from refresh token'):
+        claims = jwt_session.get_claims_from_token(
             token=old_refresh_token
         )
+        user_id = await user_session.get_user_id_from_claims(
+            db_session=db_session,
+            claims=claims
+        )
+
+    # Токен, выпущенный до версии 2, может принадлежать удаленному пользователю
+    if user_id is None:
+        raise jwt_session.credentials_exception
 
     with tracer.start_as_current_span('Disabling old access token'):
         await jwt_session.disable_access_token(
@@ -51,7 +67,8 @@ async def refresh_tokens(
     with tracer.start_as_current_span('Creating new tokens'):
         new_access_token, new_refresh_token = create_tokens(
             jwt_session=jwt_session,
-            email=email
+            email=claims.email,
+            user_id=user_id
         )
 
     with tracer.start_as_current_span('Setting new tokens to response headers'):
@@ -78,27 +95,45 @@ async def change_password(
     request: Request,
     response: Response,
     jwt_session: JWTService = Depends(get_jwt_session),
-    db_session: AsyncSession = Depends(get_postgres_session)
+    db_session: LazySession = Depends(get_postgres_session),
+    password_session: PasswordHasher = Depends(get_password_session),
+    user_session: UserService = Depends(get_user_session),
+    rate_limit_session: RateLimiter = Depends(get_rate_limit_session)
 ) -> ServiceMessageModel:
     old_access_token = request.cookies.get(f'{COOKIE_PREFIX}_access_token')
 
     with tracer.start_as_current_span('Extracting user email from access token'):
-        email = await jwt_session.get_data_from_access_token(
-            access_token=old_access_token
+        claims = await get_access_token_claims(
+            request=request,
+            jwt_session=jwt_session
+        )
+        email = claims.email
+
+    with tracer.start_as_current_span('Checking rate limits'):
+        await rate_limit_session.check(
+            route='change_password',
+            ip=request.client.host,
+            account=email
         )
 
     with tracer.start_as_current_span('Checking old password'):
-        password_check_result = await check_password(
+        user_id = await authenticate_user(
             db_session=db_session,
+            password_session=password_session,
             email=email,
             password=change_password_model.old_password
         )
-        if not password_check_result:
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail='Password didn\'t match!'
             )
 
+    with tracer.start_as_current_span('Hashing new password'):
+        new_password_hash = await password_session.hash_password(
+            password=change_password_model.new_password
+        )
+
     with tracer.start_as_current_span('Disabling old access token'):
         await jwt_session.disable_access_token(
             access_token=old_access_token
@@ -107,7 +142,8 @@ async def change_password(
     with tracer.start_as_current_span('Creating new tokens'):
         new_access_token, new_refresh_token = create_tokens(
             jwt_session=jwt_session,
-            email=email
+            email=email,
+            user_id=user_id
         )
 
     with tracer.start_as_current_span('Setting new tokens to response headers'):
@@ -118,11 +154,17 @@ async def change_password(
         )
 
     with tracer.start_as_current_span('Updating password in database'):
-        await update_user_credentials(
-            db_session=db_session,
-            email=email,
-            new_password=change_password_model.new_password,
-            new_refresh_token=new_refresh_token
+        async with db_session.acquire() as postgres_session:
+            await update_user_credentials(
+                db_session=postgres_session,
+                email=email,
+                new_password_hash=new_password_hash,
+                new_refresh_token=new_refresh_token
+            )
+
+    with tracer.start_as_current_span('Invalidating cached user data'):
+        await user_session.invalidate(
+            email=email
         )
 
     return ServiceMessageModel(
@@ -142,28 +184,84 @@ async def get_history(
     request: Request,
     paginator: Paginator = Depends(Paginator),
     jwt_session: JWTService = Depends(get_jwt_session),
-    db_session: AsyncSession = Depends(get_postgres_session)
+    db_session: LazySession = Depends(get_postgres_session),
+    user_session: UserService = Depends(get_user_session)
 ) -> list[LogonHistoryModel]:
     with tracer.start_as_current_span('Extracting user email from access token'):
-        email = await jwt_session.get_data_from_access_token(
-            access_token=request.cookies.get(f'{COOKIE_PREFIX}_access_token')
+        claims = await get_access_token_claims(
+            request=request,
+            jwt_session=jwt_session
         )
 
-    with tracer.start_as_current_span('Extracting user id from database'):
-        user_id = await get_user_id(
+    with tracer.start_as_current_span('Extracting user id'):
+        user_id = await user_session.get_user_id_from_claims(
             db_session=db_session,
-            email=email
+            claims=claims
         )
 
     with tracer.start_as_current_span('Extracting rows from database'):
-        histories = await get_auth_history(
+        async with db_session.acquire() as postgres_session:
+            histories = await get_auth_history(
+                db_session=postgres_session,
+                user_id=user_id,
+                page_number=paginator.page_number,
+                page_size=paginator.page_size
+            )
+
+    return [LogonHistoryModel(**jsonable_encoder(history)) for history in histories]
+
+
+@router.get('/logon_history/cursor',
+            tags=['Аккаунт'],
+            summary='История авторизаций пользователя с токеном продолжения',
+            description='Просмотр истории авторизаций пользователя от новых к старым. '
+                        'Для получения следующей страницы передается токен продолжения из предыдущего ответа',
+            response_model=LogonHistoryPageModel,
+            response_description='Страница истории авторизаций пользователя и токен продолжения',
+            status_code=status.HTTP_200_OK)
+@if_token_is_valid
+async def get_history_page(
+    request: Request,
+    paginator: Paginator = Depends(Paginator),
+    jwt_session: JWTService = Depends(get_jwt_session),
+    db_session: LazySession = Depends(get_postgres_session),
+    user_session: UserService = Depends(get_user_session)
+) -> LogonHistoryPageModel:
+    after = decode_cursor(paginator.cursor) if paginator.cursor else None
+
+    with tracer.start_as_current_span('Extracting user email from access token'):
+        claims = await get_access_token_claims(
+            request=request,
+            jwt_session=jwt_session
+        )
+
+    with tracer.start_as_current_span('Extracting user id'):
+        user_id = await user_session.get_user_id_from_claims(
             db_session=db_session,
-            user_id=user_id,
-            page_number=paginator.page_number,
-            page_size=paginator.page_size
+            claims=claims
         )
 
-    return [LogonHistoryModel(**jsonable_encoder(history)) for history in histories]
+    with tracer.start_as_current_span('Extracting rows from database'):
+        async with db_session.acquire() as postgres_session:
+            histories = await get_auth_history_after(
+                db_session=postgres_session,
+                user_id=user_id,
+                page_size=paginator.page_size + 1,
+                after=after
+            )
+
+    next_cursor = None
+    if len(histories) > paginator.page_size:
+        histories = histories[:paginator.page_size]
+        next_cursor = encode_cursor(
+            logon_time=histories[-1].logon_time,
+            row_id=histories[-1].id
+        )
+
+    return LogonHistoryPageModel(
+        items=[LogonHistoryModel(**jsonable_encoder(history)) for history in histories],
+        next_cursor=next_cursor
+    )
 
 
 @router.get('/logout',
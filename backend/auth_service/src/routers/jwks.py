@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from core.config import jwt_settings
+from services.keys import key_ring
+
+router = APIRouter()
+
+
+@router.get('/.well-known/jwks.json',
+            tags=['Ключи'],
+            summary='Открытые ключи подписи токенов',
+            description='Набор открытых ключей (JWKS) для локальной проверки подписи токенов',
+            response_description='Набор открытых ключей в формате JWKS',
+            status_code=status.HTTP_200_OK)
+async def get_jwks(
+    request: Request
+) -> Response:
+    if key_ring is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Tokens are signed with a shared secret'
+        )
+
+    headers = {
+        'ETag': key_ring.jwks_etag,
+        'Cache-Control': f'public, max-age={jwt_settings.jwks_max_age}'
+    }
+
+    if request.headers.get('If-None-Match') == key_ring.jwks_etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers
+        )
+
+    return Response(
+        content=key_ring.jwks,
+        media_type='application/jwk-set+json',
+        headers=headers
+    )
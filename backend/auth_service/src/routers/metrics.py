@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from core.monitoring import render_metrics
+
+router = APIRouter()
+
+
+@router.get('/metrics',
+            tags=['Мониторинг'],
+            summary='Метрики сервиса авторизации',
+            description='Метрики в текстовом формате Prometheus, агрегированные по всем процессам сервиса',
+            response_description='Метрики в текстовом формате Prometheus',
+            status_code=status.HTTP_200_OK,
+            include_in_schema=False)
+def get_metrics() -> Response:
+    # обработчик синхронный: чтение файлов метрик процессов выполняется вне цикла событий
+    return Response(
+        content=render_metrics(),
+        media_type=CONTENT_TYPE_LATEST
+    )
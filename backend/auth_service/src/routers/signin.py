@@ -4,17 +4,21 @@ import aiohttp
 from fastapi import (APIRouter, Depends, HTTPException, Request, Response,
                      status)
 from fastapi.responses import RedirectResponse
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.common import add_to_db
-from crud.user import check_password, get_user_id
-from models.models import LogonHistory
+from crud.user import authenticate_user
+from dependencies.logon_history import LogonHistoryWriter
+from dependencies.password import PasswordHasher
+from dependencies.postgres import LazySession
+from dependencies.rate_limit import RateLimiter
 from schemas.service_message import ServiceMessageModel
 from schemas.user import LocalUserAuthorizeModel
 from services.jwt import JWTService, get_jwt_session
+from services.logon_history import get_logon_history_session
 from services.oauth import (get_aiohttp_session, get_google_oauth,
                             get_yandex_oauth)
+from services.password import get_password_session
 from services.postgres import get_postgres_session
+from services.rate_limit import get_rate_limit_session
 from services.tracer import get_tracer_session
 from utils.tokens import create_tokens, set_tokens_to_cookies
 
@@ -35,39 +39,43 @@ async def authorize_local_user(
     request: Request,
     response: Response,
     jwt_session: JWTService = Depends(get_jwt_session),
-    db_session: AsyncSession = Depends(get_postgres_session)
+    db_session: LazySession = Depends(get_postgres_session),
+    password_session: PasswordHasher = Depends(get_password_session),
+    logon_history_session: LogonHistoryWriter = Depends(get_logon_history_session),
+    rate_limit_session: RateLimiter = Depends(get_rate_limit_session)
 ) -> ServiceMessageModel:
+    with tracer.start_as_current_span('Checking rate limits'):
+        await rate_limit_session.check(
+            route='signin',
+            ip=request.client.host,
+            account=local_user_authorize_model.email
+        )
+
     with tracer.start_as_current_span('Checking password'):
-        password_check_result = await check_password(
+        user_id = await authenticate_user(
             db_session=db_session,
+            password_session=password_session,
             email=local_user_authorize_model.email,
             password=local_user_authorize_model.password
         )
-        if not password_check_result:
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail='Check your login and password!'
             )
 
-    with tracer.start_as_current_span('Adding logon record to database'):
-        auth_history = LogonHistory(
+    with tracer.start_as_current_span('Queueing logon record'):
+        await logon_history_session.add(
             ip=request.client.host,
             user_agent=request.headers.get('User-Agent'),
-            user_id=await get_user_id(
-                db_session=db_session,
-                email=local_user_authorize_model.email
-            )
-        )
-
-        await add_to_db(
-            db_session=db_session,
-            instance=auth_history
+            user_id=user_id
         )
 
     with tracer.start_as_current_span('Creating new tokens'):
         access_token, refresh_token = create_tokens(
             jwt_session=jwt_session,
-            email=local_user_authorize_model.email
+            email=local_user_authorize_model.email,
+            user_id=user_id
         )
 
     with tracer.start_as_current_span('Setting new tokens to response headers'):
@@ -4,19 +4,23 @@ from typing import Annotated
 import aiohttp
 from fastapi import (APIRouter, Depends, HTTPException, Request, Response,
                      status)
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.common import add_to_db
-from crud.user import check_email, get_user_id
-from models.models import LogonHistory, User
+from crud.user import check_email, create_user
+from dependencies.logon_history import LogonHistoryWriter
+from dependencies.password import PasswordHasher
+from dependencies.postgres import LazySession
+from dependencies.rate_limit import RateLimiter
 from schemas.service_message import ServiceMessageModel
 from schemas.user import LocalUserCreateModel
 from services.jwt import JWTService, get_jwt_session
+from services.logon_history import get_logon_history_session
 from services.oauth import (get_aiohttp_session, get_google_oauth,
                             get_yandex_oauth)
+from services.password import get_password_session
 from services.postgres import get_postgres_session
+from services.rate_limit import get_rate_limit_session
 from services.tracer import get_tracer_session
+from services.user import UserService, get_user_session
 from utils.tokens import create_tokens, set_tokens_to_cookies
 
 router = APIRouter()
@@ -36,24 +40,48 @@ async def create_local_user(
     request: Request,
     response: Response,
     jwt_session: JWTService = Depends(get_jwt_session),
-    db_session: AsyncSession = Depends(get_postgres_session)
+    db_session: LazySession = Depends(get_postgres_session),
+    password_session: PasswordHasher = Depends(get_password_session),
+    user_session: UserService = Depends(get_user_session),
+    logon_history_session: LogonHistoryWriter = Depends(get_logon_history_session),
+    rate_limit_session: RateLimiter = Depends(get_rate_limit_session)
 ) -> ServiceMessageModel:
-    user = User(**jsonable_encoder(local_user_create_model))
+    with tracer.start_as_current_span('Checking rate limits'):
+        await rate_limit_session.check(
+            route='signup',
+            ip=request.client.host
+        )
+
+    with tracer.start_as_current_span('Hashing password'):
+        password_hash = await password_session.hash_password(
+            password=local_user_create_model.password
+        )
 
-    with tracer.start_as_current_span('Checking if email is already claimed'):
-        if not await check_email(
-            db_session=db_session,
-            email=user.email
-        ):
+    with tracer.start_as_current_span('Adding user record to database'):
+        async with db_session.acquire() as postgres_session:
+            user_id = await create_user(
+                db_session=postgres_session,
+                password_hash=password_hash,
+                **local_user_create_model.model_dump(
+                    exclude=['password']
+                )
+            )
+
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail='Account with provided email is already exists!'
             )
 
+        await user_session.invalidate(
+            email=local_user_create_model.email
+        )
+
     with tracer.start_as_current_span('Creating tokens'):
         access_token, refresh_token = create_tokens(
             jwt_session=jwt_session,
-            email=user.email
+            email=local_user_create_model.email,
+            user_id=user_id
         )
 
     with tracer.start_as_current_span('Setting tokens to response headers'):
@@ -63,27 +91,11 @@ async def create_local_user(
             refresh_token=refresh_token
         )
 
-    user.refresh_token = refresh_token
-
-    with tracer.start_as_current_span('Adding user record to database'):
-        await add_to_db(
-            db_session=db_session,
-            instance=user
-        )
-
-    with tracer.start_as_current_span('Adding logon record to database'):
-        auth_history = LogonHistory(
+    with tracer.start_as_current_span('Queueing logon record'):
+        await logon_history_session.add(
             ip=request.client.host,
             user_agent=request.headers.get('User-Agent'),
-            user_id=await get_user_id(
-                db_session=db_session,
-                email=user.email
-            )
-        )
-
-        await add_to_db(
-            db_session=db_session,
-            instance=auth_history
+            user_id=user_id
         )
 
     return ServiceMessageModel(
@@ -104,8 +116,17 @@ async def create_oauth_user(
     request: Request,
     service: Annotated[str, ['google', 'yandex']] = None,
     session: aiohttp.ClientSession = Depends(get_aiohttp_session),
-    db_session: AsyncSession = Depends(get_postgres_session)
+    db_session: LazySession = Depends(get_postgres_session),
+    password_session: PasswordHasher = Depends(get_password_session),
+    user_session: UserService = Depends(get_user_session),
+    rate_limit_session: RateLimiter = Depends(get_rate_limit_session)
 ) -> ServiceMessageModel:
+    with tracer.start_as_current_span('Checking rate limits'):
+        await rate_limit_session.check(
+            route='oauth_signup',
+            ip=request.client.host
+        )
+
     with tracer.start_as_current_span('Getting Oauth authorization code'):
         if service == 'google':
             google_oauth = get_google_oauth(
@@ -128,10 +149,13 @@ async def create_oauth_user(
 
     # проверяем, существует ли пользователь с email, возвращённым сервисом
     with tracer.start_as_current_span('Checking if user with this email is already exists'):
-        if not await check_email(
-                db_session=db_session,
+        async with db_session.acquire() as postgres_session:
+            email_is_free = await check_email(
+                db_session=postgres_session,
                 email=user_oauth_model.email
-        ):
+            )
+
+        if not email_is_free:
             # really???
             return ServiceMessageModel(
                 message='Successfully authorized!'
@@ -143,17 +167,29 @@ async def create_oauth_user(
             nbytes=10
         )
 
+    with tracer.start_as_current_span('Hashing password'):
+        password_hash = await password_session.hash_password(
+            password=password
+        )
+
     with tracer.start_as_current_span('Adding user record to database'):
-        user = User(
-            password=password,
-            **user_oauth_model.model_dump(
-                exclude=['id']
+        async with db_session.acquire() as postgres_session:
+            user_id = await create_user(
+                db_session=postgres_session,
+                password_hash=password_hash,
+                **user_oauth_model.model_dump(
+                    exclude=['id']
+                )
+            )
+
+        # пользователь мог быть зарегистрирован параллельным запросом
+        if user_id is None:
+            return ServiceMessageModel(
+                message='Successfully authorized!'
             )
-        )
 
-        await add_to_db(
-            db_session=db_session,
-            instance=user
+        await user_session.invalidate(
+            email=user_oauth_model.email
         )
 
     return ServiceMessageModel(
@@ -0,0 +1,89 @@
+import time
+
+import grpc
+
+from core.metrics import GRPC_IN_FLIGHT, GRPC_LATENCY
+
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    '''Интерсептор, фиксирующий число выполняющихся вызовов и их длительность по методам'''
+
+    async def intercept_service(
+        self,
+        continuation,
+        handler_call_details: grpc.HandlerCallDetails
+    ):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        method = handler_call_details.method
+
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._wrap_unary(handler.unary_unary, method),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(
+                self._wrap_unary(handler.stream_unary, method),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                self._wrap_stream(handler.unary_stream, method),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+        if handler.stream_stream:
+            return grpc.stream_stream_rpc_method_handler(
+                self._wrap_stream(handler.stream_stream, method),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+
+        return handler
+
+    @staticmethod
+    def _wrap_unary(
+        behavior,
+        method: str
+    ):
+        async def wrapper(request, context):
+            in_flight = GRPC_IN_FLIGHT.labels(method)
+            in_flight.inc()
+            start = time.perf_counter()
+            status = 'error'
+
+            try:
+                response = await behavior(request, context)
+                status = 'ok'
+                return response
+            finally:
+                in_flight.dec()
+                GRPC_LATENCY.labels(method, status).observe(time.perf_counter() - start)
+
+        return wrapper
+
+    @staticmethod
+    def _wrap_stream(
+        behavior,
+        method: str
+    ):
+        async def wrapper(request, context):
+            in_flight = GRPC_IN_FLIGHT.labels(method)
+            in_flight.inc()
+            start = time.perf_counter()
+            status = 'error'
+
+            try:
+                async for response in behavior(request, context):
+                    yield response
+                status = 'ok'
+            finally:
+                in_flight.dec()
+                GRPC_LATENCY.labels(method, status).observe(time.perf_counter() - start)
+
+        return wrapper
@@ -1,14 +1,17 @@
-from concurrent import futures
+import asyncio
+import contextlib
 
 import grpc
 
-from core.config import postgres_settings
-from crud.user import get_user_id
-from dependencies import postgres
+from core.config import auth_api_settings
+from rpc.authenticator_server.interceptors import MetricsInterceptor
 from rpc.authenticator_server.types import (authenticator_pb2,
                                             authenticator_pb2_grpc)
+from schemas.token import TokenClaimsModel
 from services.jwt import get_jwt_session
+from services.postgres import get_postgres_session
 from services.redis import get_redis_session
+from services.user import get_user_session
 
 
 class Authenticator(authenticator_pb2_grpc.AuthenticatorServicer):
@@ -36,46 +39,272 @@ class Authenticator(authenticator_pb2_grpc.AuthenticatorServicer):
         request: authenticator_pb2.Token,
         context
     ) -> authenticator_pb2.UserID:
-        '''Функция извлечения ID пользователя из предъявленного токена'''
-
-        async with postgres.get_sessionmaker(
-            user=postgres_settings.user,
-            password=postgres_settings.password,
-            host=postgres_settings.host,
-            port=postgres_settings.port,
-            dbname=postgres_settings.dbname,
-        )() as db_session:
-            jwt_session = get_jwt_session(
+        '''
+        Функция извлечения ID пользователя из предъявленного токена.
+        Токены версии 2 содержат ID пользователя, и обращение к БД не требуется
+        '''
+
+        jwt_session = get_jwt_session(
+            redis_session=await get_redis_session()
+        )
+
+        claims = await jwt_session.verify_access_token(
+            access_token=request.token
+        )
+
+        if claims is None:
+            await context.abort(
+                grpc.StatusCode.UNAUTHENTICATED,
+                'Could not validate credentials'
+            )
+
+        if claims.user_id is not None:
+            return authenticator_pb2.UserID(
+                user_id=claims.user_id
+            )
+
+        user_session = get_user_session(
+            redis_session=await get_redis_session()
+        )
+
+        user_id = await user_session.get_user_id(
+            db_session=get_postgres_session(),
+            email=claims.email
+        )
+
+        return authenticator_pb2.UserID(
+            user_id=str(user_id)
+        )
+
+    async def _check_batch_size(
+        self,
+        request: authenticator_pb2.TokenBatch,
+        context
+    ) -> None:
+        '''Функция проверки размера пакета токенов'''
+
+        if len(request.tokens) > auth_api_settings.max_batch_size:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f'Batch size exceeds {auth_api_settings.max_batch_size} tokens'
+            )
+
+    async def CheckTokens(
+        self,
+        request: authenticator_pb2.TokenBatch,
+        context
+    ) -> authenticator_pb2.TokenValidityBatch:
+        '''Функция пакетной проверки валидности токенов'''
+
+        await self._check_batch_size(request, context)
+
+        jwt_session = get_jwt_session(
+            redis_session=await get_redis_session()
+        )
+
+        claims_list = await jwt_session.verify_access_tokens(
+            access_tokens=list(request.tokens)
+        )
+
+        return authenticator_pb2.TokenValidityBatch(
+            results=[
+                authenticator_pb2.TokenValidity(
+                    is_valid=claims is not None
+                )
+                for claims in claims_list
+            ]
+        )
+
+    async def _resolve_tokens(
+        self,
+        tokens: list[str]
+    ) -> list[tuple[TokenClaimsModel | None, str | None]]:
+        '''
+        Функция проверки пакета токенов и извлечения ID их пользователей
+        с одним запросом к Redis. К БД обращаются только токены,
+        выпущенные до появления ID пользователя в токене
+
+        :param tokens: проверяемые токены
+        :return: данные токенов и ID пользователей в порядке запроса
+        '''
+
+        jwt_session = get_jwt_session(
+            redis_session=await get_redis_session()
+        )
+
+        claims_list = await jwt_session.verify_access_tokens(
+            access_tokens=tokens
+        )
+
+        emails = [
+            claims.email
+            for claims in claims_list
+            if claims is not None and claims.user_id is None
+        ]
+
+        user_ids = {}
+        if emails:
+            user_session = get_user_session(
                 redis_session=await get_redis_session()
             )
 
-            email = await jwt_session.get_data_from_access_token(
-                access_token=request.token
+            user_ids = await user_session.get_user_ids(
+                db_session=get_postgres_session(),
+                emails=emails
             )
 
-            user_id = await get_user_id(
-                db_session=db_session,
-                email=email
+        return [
+            (
+                claims,
+                None if claims is None else claims.user_id or user_ids.get(claims.email)
             )
+            for claims in claims_list
+        ]
 
-            return authenticator_pb2.UserID(
-                user_id=str(user_id)
+    async def ResolveUsers(
+        self,
+        request: authenticator_pb2.TokenBatch,
+        context
+    ) -> authenticator_pb2.UserIdentityBatch:
+        '''Функция пакетной проверки токенов и извлечения ID их пользователей'''
+
+        await self._check_batch_size(request, context)
+
+        resolved_tokens = await self._resolve_tokens(
+            tokens=list(request.tokens)
+        )
+
+        return authenticator_pb2.UserIdentityBatch(
+            results=[
+                authenticator_pb2.UserIdentity(
+                    is_valid=user_id is not None,
+                    user_id=str(user_id) if user_id is not None else ''
+                )
+                for _, user_id in resolved_tokens
+            ]
+        )
+
+    async def _read_introspection_requests(
+        self,
+        request_iterator,
+        queue: asyncio.Queue
+    ) -> None:
+        '''
+        Функция чтения запросов из потока клиента в ограниченную очередь.
+        Когда очередь заполнена, чтение из потока приостанавливается,
+        и управление потоком HTTP/2 притормаживает клиента.
+        Признак конца потока не ожидает места в очереди, чтобы отмена чтения
+        не блокировалась; при заполненной очереди его заменяет завершение задачи
+
+        :param request_iterator: поток запросов клиента
+        :param queue: очередь запросов
+        '''
+
+        try:
+            async for request in request_iterator:
+                await queue.put(request)
+        finally:
+            with contextlib.suppress(asyncio.QueueFull):
+                queue.put_nowait(None)
+
+    async def Introspect(
+        self,
+        request_iterator,
+        context
+    ):
+        '''
+        Функция потоковой проверки токенов. Запросы, поступившие в пределах
+        короткого окна, обрабатываются одним пакетом; ответы сопоставляются
+        с запросами по request_id
+        '''
+
+        queue = asyncio.Queue(
+            maxsize=auth_api_settings.introspect_max_pending
+        )
+        reader = asyncio.create_task(
+            self._read_introspection_requests(
+                request_iterator=request_iterator,
+                queue=queue
             )
+        )
+        loop = asyncio.get_running_loop()
+        window = auth_api_settings.introspect_batch_window_ms / 1000
+
+        async def get_request(timeout: float | None = None):
+            if queue.empty() and reader.done():
+                return None
+
+            return await asyncio.wait_for(queue.get(), timeout)
+
+        try:
+            finished = False
+            while not finished:
+                request = await get_request()
+                if request is None:
+                    break
+
+                batch = [request]
+                deadline = loop.time() + window
+                while len(batch) < auth_api_settings.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+
+                    try:
+                        request = await get_request(timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+                    if request is None:
+                        finished = True
+                        break
+
+                    batch.append(request)
+
+                resolved_tokens = await self._resolve_tokens(
+                    tokens=[request.token for request in batch]
+                )
+
+                for request, (claims, user_id) in zip(batch, resolved_tokens):
+                    yield authenticator_pb2.IntrospectionResponse(
+                        request_id=request.request_id,
+                        is_valid=user_id is not None,
+                        user_id=str(user_id) if user_id is not None else '',
+                        expires_at=claims.expires_at if user_id is not None else 0
+                    )
+
+            await reader
+        finally:
+            reader.cancel()
 
 
 def get_authenticator_server(
     port: int
-) -> grpc.Server:
+) -> grpc.aio.Server:
     '''
-    Функция инициализации grpc-сервера аутентицикации
+    Функция инициализации grpc-сервера аутентицикации.
+    Все методы сервисера асинхронные, поэтому сервер работает в цикле событий
+    без пула потоков
 
     :param port: порт запускаемого сервера
     '''
 
     server = grpc.aio.server(
-        futures.ThreadPoolExecutor(
-            max_workers=10
-        )
+        interceptors=[MetricsInterceptor()],
+        options=[
+            ('grpc.so_reuseport', 1),
+            ('grpc.keepalive_time_ms', auth_api_settings.grpc_keepalive_time_ms),
+            ('grpc.keepalive_timeout_ms', auth_api_settings.grpc_keepalive_timeout_ms),
+            ('grpc.keepalive_permit_without_calls', 1),
+            ('grpc.max_send_message_length', auth_api_settings.grpc_max_message_length),
+            ('grpc.max_receive_message_length', auth_api_settings.grpc_max_message_length),
+        ],
+        maximum_concurrent_rpcs=auth_api_settings.grpc_maximum_concurrent_rpcs,
+        compression={
+            'none': grpc.Compression.NoCompression,
+            'deflate': grpc.Compression.Deflate,
+            'gzip': grpc.Compression.Gzip,
+        }[auth_api_settings.grpc_compression]
     )
 
     authenticator_pb2_grpc.add_AuthenticatorServicer_to_server(
@@ -7,13 +7,14 @@ from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
 from google.protobuf.internal import builder as _builder
-
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61uthenticator.proto\x12\rauthenticator\"\x16\n\x05Token\x12\r\n\x05token\x18\x01 \x01(\t\"!\n\rTokenValidity\x12\x10\n\x08is_valid\x18\x01 \x01(\x08\"\x19\n\x06UserID\x12\x0f\n\x07user_id\x18\x01 \x01(\t2\x8f\x01\n\rAuthenticator\x12\x42\n\nCheckToken\x12\x14.authenticator.Token\x1a\x1c.authenticator.TokenValidity\"\x00\x12:\n\tGetUserID\x12\x14.authenticator.Token\x1a\x15.authenticator.UserID\"\x00\x62\x06proto3')
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61uthenticator.proto\x12\rauthenticator\"\x16\n\x05Token\x12\r\n\x05token\x18\x01 \x01(\t\"!\n\rTokenValidity\x12\x10\n\x08is_valid\x18\x01 \x01(\x08\"\x19\n\x06UserID\x12\x0f\n\x07user_id\x18\x01 \x01(\t\"\x1c\n\nTokenBatch\x12\x0e\n\x06tokens\x18\x01 \x03(\t\"C\n\x12TokenValidityBatch\x12-\n\x07results\x18\x01 \x03(\x0b\x32\x1c.authenticator.TokenValidity\"1\n\x0cUserIdentity\x12\x10\n\x08is_valid\x18\x01 \x01(\x08\x12\x0f\n\x07user_id\x18\x02 \x01(\t\"A\n\x11UserIdentityBatch\x12,\n\x07results\x18\x01 \x03(\x0b\x32\x1b.authenticator.UserIdentity\"9\n\x14IntrospectionRequest\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12\r\n\x05token\x18\x02 \x01(\t\"b\n\x15IntrospectionResponse\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12\x10\n\x08is_valid\x18\x02 \x01(\x08\x12\x0f\n\x07user_id\x18\x03 \x01(\t\x12\x12\n\nexpires_at\x18\x04 \x01(\x03\x32\x8c\x03\n\rAuthenticator\x12\x42\n\nCheckToken\x12\x14.authenticator.Token\x1a\x1c.authenticator.TokenValidity\"\x00\x12:\n\tGetUserID\x12\x14.authenticator.Token\x1a\x15.authenticator.UserID\"\x00\x12M\n\x0b\x43heckTokens\x12\x19.authenticator.TokenBatch\x1a!.authenticator.TokenValidityBatch\"\x00\x12M\n\x0cResolveUsers\x12\x19.authenticator.TokenBatch\x1a .authenticator.UserIdentityBatch\"\x00\x12]\n\nIntrospect\x12#.authenticator.IntrospectionRequest\x1a$.authenticator.IntrospectionResponse\"\x00(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -26,6 +27,18 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_TOKENVALIDITY']._serialized_end=95
   _globals['_USERID']._serialized_start=97
   _globals['_USERID']._serialized_end=122
-  _globals['_AUTHENTICATOR']._serialized_start=125
-  _globals['_AUTHENTICATOR']._serialized_end=268
+  _globals['_TOKENBATCH']._serialized_start=124
+  _globals['_TOKENBATCH']._serialized_end=152
+  _globals['_TOKENVALIDITYBATCH']._serialized_start=154
+  _globals['_TOKENVALIDITYBATCH']._serialized_end=221
+  _globals['_USERIDENTITY']._serialized_start=223
+  _globals['_USERIDENTITY']._serialized_end=272
+  _globals['_USERIDENTITYBATCH']._serialized_start=274
+  _globals['_USERIDENTITYBATCH']._serialized_end=339
+  _globals['_INTROSPECTIONREQUEST']._serialized_start=341
+  _globals['_INTROSPECTIONREQUEST']._serialized_end=398
+  _globals['_INTROSPECTIONRESPONSE']._serialized_start=400
+  _globals['_INTROSPECTIONRESPONSE']._serialized_end=498
+  _globals['_AUTHENTICATOR']._serialized_start=501
+  _globals['_AUTHENTICATOR']._serialized_end=897
 # @@protoc_insertion_point(module_scope)
@@ -24,6 +24,21 @@ class AuthenticatorStub(object):
                 request_serializer=authenticator__pb2.Token.SerializeToString,
                 response_deserializer=authenticator__pb2.UserID.FromString,
                 )
+        self.CheckTokens = channel.unary_unary(
+                '/authenticator.Authenticator/CheckTokens',
+                request_serializer=authenticator__pb2.TokenBatch.SerializeToString,
+                response_deserializer=authenticator__pb2.TokenValidityBatch.FromString,
+                )
+        self.ResolveUsers = channel.unary_unary(
+                '/authenticator.Authenticator/ResolveUsers',
+                request_serializer=authenticator__pb2.TokenBatch.SerializeToString,
+                response_deserializer=authenticator__pb2.UserIdentityBatch.FromString,
+                )
+        self.Introspect = channel.stream_stream(
+                '/authenticator.Authenticator/Introspect',
+                request_serializer=authenticator__pb2.IntrospectionRequest.SerializeToString,
+                response_deserializer=authenticator__pb2.IntrospectionResponse.FromString,
+                )
 
 
 class AuthenticatorServicer(object):
@@ -41,6 +56,24 @@ class AuthenticatorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CheckTokens(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ResolveUsers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Introspect(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_AuthenticatorServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -54,6 +87,21 @@ def add_AuthenticatorServicer_to_server(servicer, server):
                     request_deserializer=authenticator__pb2.Token.FromString,
                     response_serializer=authenticator__pb2.UserID.SerializeToString,
             ),
+            'CheckTokens': grpc.unary_unary_rpc_method_handler(
+                    servicer.CheckTokens,
+                    request_deserializer=authenticator__pb2.TokenBatch.FromString,
+                    response_serializer=authenticator__pb2.TokenValidityBatch.SerializeToString,
+            ),
+            'ResolveUsers': grpc.unary_unary_rpc_method_handler(
+                    servicer.ResolveUsers,
+                    request_deserializer=authenticator__pb2.TokenBatch.FromString,
+                    response_serializer=authenticator__pb2.UserIdentityBatch.SerializeToString,
+            ),
+            'Introspect': grpc.stream_stream_rpc_method_handler(
+                    servicer.Introspect,
+                    request_deserializer=authenticator__pb2.IntrospectionRequest.FromString,
+                    response_serializer=authenticator__pb2.IntrospectionResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'authenticator.Authenticator', rpc_method_handlers)
@@ -97,3 +145,54 @@ class Authenticator(object):
             authenticator__pb2.UserID.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CheckTokens(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/authenticator.Authenticator/CheckTokens',
+            authenticator__pb2.TokenBatch.SerializeToString,
+            authenticator__pb2.TokenValidityBatch.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ResolveUsers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/authenticator.Authenticator/ResolveUsers',
+            authenticator__pb2.TokenBatch.SerializeToString,
+            authenticator__pb2.UserIdentityBatch.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Introspect(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/authenticator.Authenticator/Introspect',
+            authenticator__pb2.IntrospectionRequest.SerializeToString,
+            authenticator__pb2.IntrospectionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
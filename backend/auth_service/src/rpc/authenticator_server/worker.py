@@ -0,0 +1,53 @@
+import asyncio
+import signal
+
+from core.config import auth_api_settings, metrics_settings
+from core.lifecycle import close_storage, open_storage
+from core.monitoring import monitor_event_loop_lag
+from rpc.authenticator_server.server import get_authenticator_server
+
+
+async def serve(
+    port: int,
+    on_ready=None
+) -> None:
+    '''
+    Функция работы отдельного процесса gRPC-сервера до получения SIGTERM или SIGINT.
+    Несколько процессов слушают один порт за счет SO_REUSEPORT
+
+    :param port: порт gRPC-сервера
+    :param on_ready: функция, вызываемая после запуска сервера
+    '''
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop_event.set)
+
+    revocation_filter_task = await open_storage()
+
+    event_loop_lag_task = asyncio.create_task(
+        monitor_event_loop_lag(
+            interval=metrics_settings.event_loop_lag_interval
+        )
+    )
+
+    authenticator_server = get_authenticator_server(
+        port=port
+    )
+    await authenticator_server.start()
+
+    if on_ready is not None:
+        on_ready()
+
+    await stop_event.wait()
+
+    await authenticator_server.stop(
+        grace=auth_api_settings.shutdown_timeout / 2
+    )
+
+    event_loop_lag_task.cancel()
+
+    await close_storage(
+        revocation_filter_task=revocation_filter_task
+    )
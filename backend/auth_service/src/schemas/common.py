@@ -22,3 +22,4 @@ class Paginator(BaseModel):
 
     page_size: Annotated[int, Query(description='Размер страницы', ge=1)] = 10
     page_number: Annotated[int, Query(description='Номер страницы', ge=1)] = 1
+    cursor: Annotated[str | None, Query(description='Токен продолжения, полученный с предыдущей страницей')] = None
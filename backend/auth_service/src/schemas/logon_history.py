@@ -10,3 +10,10 @@ class LogonHistoryModel(CommonModel):
 
     class Config:
         from_attributes = True
+
+
+class LogonHistoryPageModel(CommonModel):
+    '''Модель данных страницы историй авторизаций пользователя с токеном продолжения'''
+
+    items: list[LogonHistoryModel]
+    next_cursor: str | None = None
@@ -0,0 +1,30 @@
+from pydantic import AliasChoices, Field
+
+from schemas.common import CommonModel
+
+
+class TokenClaimsModel(CommonModel):
+    '''
+    Модель проверенных данных, содержащихся в JWT-токене.
+    Токены версии 1 содержат только sub и exp, начиная с версии 2
+    в токен также входят ID пользователя, время выпуска и ID токена
+    '''
+
+    version: int = Field(
+        default=1,
+        validation_alias=AliasChoices('ver', 'version')
+    )
+    email: str = Field(validation_alias=AliasChoices('sub', 'email'))
+    expires_at: int = Field(validation_alias=AliasChoices('exp', 'expires_at'))
+    token_id: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices('jti', 'token_id')
+    )
+    user_id: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices('uid', 'user_id')
+    )
+    issued_at: int | None = Field(
+        default=None,
+        validation_alias=AliasChoices('iat', 'issued_at')
+    )
@@ -1,12 +1,103 @@
-from datetime import datetime, timedelta
+import hashlib
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
+from jose.backends.base import Key
 from jose.constants import ALGORITHMS
+from pydantic import ValidationError
 from redis.asyncio.client import Redis
 
 from core.config import jwt_settings
+from core.metrics import JWT_CACHE_REQUESTS, JWT_LATENCY
+from schemas.token import TokenClaimsModel
+from services import keys, revocation
 from services.redis import get_redis_session
+from services.revocation import REVOCATION_CHANNEL
+from utils.cache import LRUCache
+
+DENYLIST_PREFIX = 'revoked:'
+
+TOKEN_VERSION = 2
+
+JWT_ENCODE_LATENCY = JWT_LATENCY.labels('encode')
+JWT_DECODE_LATENCY = JWT_LATENCY.labels('decode')
+
+
+class TokenCache(LRUCache):
+    '''
+    Ограниченный по размеру LRU-кеш проверенных токенов.
+    Ключом служит дайджест токена, запись живет не дольше срока действия токена
+    '''
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: int
+    ):
+        super().__init__(max_size)
+        self.ttl = ttl
+
+    @staticmethod
+    def _get_key(
+        token: str
+    ) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(
+        self,
+        token: str
+    ) -> TokenClaimsModel | None:
+        '''
+        Функция получения данных токена из кеша
+
+        :param token: искомый токен
+        '''
+
+        if not self.max_size:
+            return None
+
+        claims = super().get(self._get_key(token))
+        JWT_CACHE_REQUESTS.labels('miss' if claims is None else 'hit').inc()
+        return claims
+
+    def put(
+        self,
+        token: str,
+        claims: TokenClaimsModel
+    ) -> None:
+        '''
+        Функция сохранения данных проверенного токена в кеш
+
+        :param token: проверенный токен
+        :param claims: данные токена
+        '''
+
+        super().put(
+            key=self._get_key(token),
+            value=claims,
+            expires_at=min(claims.expires_at, time.time() + self.ttl)
+        )
+
+    def discard(
+        self,
+        token: str
+    ) -> None:
+        '''
+        Функция удаления токена из кеша
+
+        :param token: удаляемый токен
+        '''
+
+        super().discard(self._get_key(token))
+
+
+token_cache = TokenCache(
+    max_size=jwt_settings.token_cache_size,
+    ttl=jwt_settings.token_cache_ttl
+)
 
 
 class BasicJWTService:
@@ -24,31 +115,79 @@ class BasicJWTService:
 
     def __init__(self):
         self.settings = jwt_settings
-        self.algorithm = ALGORITHMS.HS256
+        self.algorithm = jwt_settings.algorithm
+        self.key_ring = keys.key_ring
+
+    def _get_verification_key(
+        self,
+        token: str
+    ) -> tuple[str | Key, str] | None:
+        '''
+        Функция выбора ключа проверки подписи по заголовку токена.
+        При асимметричной подписи ключ выбирается по kid; токены, подписанные
+        общим секретом до перехода на асимметричную подпись, принимаются,
+        пока включена настройка legacy_hs256_verification
+
+        :param token: проверяемый токен
+        :return: ключ и алгоритм или None, если ключ не найден
+        '''
+
+        if self.key_ring is None:
+            return self.settings.secret, ALGORITHMS.HS256
+
+        header = jwt.get_unverified_header(token)
+
+        if header.get('alg') == ALGORITHMS.HS256:
+            if self.settings.legacy_hs256_verification:
+                return self.settings.secret, ALGORITHMS.HS256
+
+            return None
+
+        key = self.key_ring.get_verification_key(header.get('kid'))
+        if key is None:
+            return None
+
+        return key, self.algorithm
 
     def _create_token(
         self,
         email: str,
+        user_id: str,
         expires_delta: timedelta
     ) -> str:
         '''
         Функция генерации токена
 
         :param email: email пользователя
+        :param user_id: ID пользователя
         :param expires_delta: время жизни токена
         '''
 
-        expire = datetime.now() + expires_delta
+        issued_at = datetime.now(timezone.utc)
         to_encode = {
+            'ver': TOKEN_VERSION,
             'sub': email,
-            'exp': expire
+            'uid': str(user_id),
+            'iat': issued_at,
+            'exp': issued_at + expires_delta,
+            'jti': uuid.uuid4().hex
         }
 
+        if self.key_ring is None:
+            key, headers = self.settings.secret, None
+        else:
+            key, headers = self.key_ring.signing_key, {
+                'kid': self.key_ring.active_key_id
+            }
+
+        start = time.perf_counter()
         encoded_jwt = jwt.encode(
             claims=to_encode,
-            key=self.settings.secret,
-            algorithm=self.algorithm
+            key=key,
+            algorithm=self.algorithm,
+            headers=headers
         )
+        JWT_ENCODE_LATENCY.observe(time.perf_counter() - start)
 
         return encoded_jwt
 
@@ -86,53 +225,96 @@ class BasicJWTService:
             ),
         )
 
-    def check_token(
+    def decode_token(
         self,
         token: str
-    ) -> bool:
+    ) -> TokenClaimsModel | None:
         '''
-        Функция проверки валидности токена
+        Функция однократной проверки подписи токена и разбора его данных
 
         :param token: проверяемый токен
+        :return: данные токена или None, если токен невалиден
         '''
 
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
+
         try:
-            jwt.decode(
-                token=token,
-                key=self.settings.secret,
-                algorithms=[self.algorithm]
+            verification_key = self._get_verification_key(
+                token=token
             )
-        except JWTError:
-            return False
+            if verification_key is None:
+                return None
+
+            key, algorithm = verification_key
+            start = time.perf_counter()
+            try:
+                payload = jwt.decode(
+                    token=token,
+                    key=key,
+                    algorithms=[algorithm]
+                )
+            finally:
+                JWT_DECODE_LATENCY.observe(time.perf_counter() - start)
+
+            claims = TokenClaimsModel(**payload)
+        except (JWTError, ValidationError):
+            return None
+
+        token_cache.put(
+            token=token,
+            claims=claims
+        )
 
-        return True
+        return claims
 
-    def get_data_from_token(
+    def check_token(
         self,
         token: str
-    ) -> tuple[str, str | None]:
+    ) -> bool:
         '''
-        Функция извлечения данных, содержащихся в токене
+        Функция проверки валидности токена
 
         :param token: проверяемый токен
         '''
 
-        try:
-            payload = jwt.decode(
-                token=token,
-                key=self.settings.secret,
-                algorithms=[self.algorithm]
-            )
+        return self.decode_token(
+            token=token
+        ) is not None
 
-        except JWTError:
-            raise self.credentials_exception
+    def get_claims_from_token(
+        self,
+        token: str
+    ) -> TokenClaimsModel:
+        '''
+        Функция извлечения проверенных данных, содержащихся в токене
+
+        :param token: проверяемый токен
+        '''
 
-        email = payload.get('sub')
+        claims = self.decode_token(
+            token=token
+        )
 
-        if email is None:
+        if claims is None:
             raise self.credentials_exception
 
-        return email
+        return claims
+
+    def get_data_from_token(
+        self,
+        token: str
+    ) -> str:
+        '''
+        Функция извлечения данных, содержащихся в токене
+
+        :param token: проверяемый токен
+        '''
+
+        return self.get_claims_from_token(
+            token=token
+        ).email
 
 
 class JWTService(BasicJWTService):
@@ -149,22 +331,137 @@ class JWTService(BasicJWTService):
         self.redis_session = redis_session
         super().__init__(*args, **kwargs)
 
-    async def is_token_invalid(
+    def _get_denylist_keys(
+        self,
+        token: str,
+        claims: TokenClaimsModel | None
+    ) -> list[str]:
+        '''
+        Функция получения ключей Redis, под которыми может храниться отозванный токен.
+        Токен отзывается по короткому идентификатору jti; на время перехода
+        также проверяется ключ, равный самому токену
+
+        :param token: проверяемый токен
+        :param claims: данные токена
+        '''
+
+        if claims is None or claims.token_id is None:
+            return [token]
+
+        denylist_keys = [f'{DENYLIST_PREFIX}{claims.token_id}']
+        if self.settings.legacy_denylist_lookup:
+            denylist_keys.append(token)
+
+        return denylist_keys
+
+    def _get_denylist_record(
         self,
         token: str
+    ) -> tuple[str, int] | None:
+        '''
+        Функция получения ключа и времени жизни записи об отзыве токена
+
+        :param token: отзываемый токен
+        :return: ключ и время жизни записи, секунд, или None, если токен уже невалиден
+        '''
+
+        claims = self.decode_token(
+            token=token
+        )
+
+        if claims is None:
+            return None
+
+        ttl = max(int(claims.expires_at - time.time()), 1)
+
+        if claims.token_id is None:
+            return token, ttl
+
+        return f'{DENYLIST_PREFIX}{claims.token_id}', ttl
+
+    def _get_lookup_keys(
+        self,
+        token: str,
+        claims: TokenClaimsModel | None
+    ) -> list[str]:
+        '''
+        Функция получения ключей, которые нужно проверить в Redis.
+        Ключи, отсутствующие в локальном фильтре отозванных токенов, отбрасываются
+
+        :param token: проверяемый токен
+        :param claims: данные токена
+        '''
+
+        denylist_keys = self._get_denylist_keys(
+            token=token,
+            claims=claims
+        )
+
+        if revocation.revocation_filter is None:
+            return denylist_keys
+
+        return revocation.revocation_filter.get_candidates(denylist_keys)
+
+    async def _revoke(
+        self,
+        records: list[tuple[str, int]]
+    ) -> None:
+        '''
+        Функция записи ключей отозванных токенов в Redis и оповещения
+        других узлов за один конвейерный запрос
+
+        :param records: ключи и время жизни записей об отзыве
+        '''
+
+        if not records:
+            return
+
+        async with self.redis_session.pipeline(transaction=False) as pipe:
+            for key, ttl in records:
+                pipe.set(
+                    name=key,
+                    value='true',
+                    ex=ttl
+                )
+                pipe.publish(REVOCATION_CHANNEL, key)
+
+            await pipe.execute()
+
+        if revocation.revocation_filter is not None:
+            for key, _ in records:
+                revocation.revocation_filter.add(key)
+
+    async def is_token_invalid(
+        self,
+        token: str,
+        claims: TokenClaimsModel | None = None
     ) -> bool:
         '''
-        Проверяет наличие токена среди базы невалидных токенов в Redis
+        Проверяет наличие токена среди базы невалидных токенов в Redis.
+        Если локальный фильтр гарантирует отсутствие токена, запрос к Redis не выполняется
 
         :param token: проверяемый токен
+        :param claims: данные токена, если он уже разобран
         '''
 
-        result = await self.redis_session.get(token)
-        return bool(result)
+        lookup_keys = self._get_lookup_keys(
+            token=token,
+            claims=claims
+        )
+
+        if not lookup_keys:
+            return False
+
+        result = bool(await self.redis_session.exists(*lookup_keys))
+
+        if revocation.revocation_filter is not None:
+            revocation.revocation_filter.record_confirmation(result)
+
+        return result
 
     async def disable_access_token(
         self,
-        access_token=str
+        access_token: str
     ) -> None:
         '''
         Функция для отправки неактуального access_token в Redis
@@ -172,53 +469,169 @@ class JWTService(BasicJWTService):
         :param access_token: отправляемый access_token
         '''
 
-        return await self.redis_session.set(
-            name=access_token,
-            value='true',
-            ex=timedelta(
-                minutes=self.settings.access_lifetime
-            ),
+        await self.disable_access_tokens(
+            access_tokens=[access_token]
         )
 
-    async def check_access_token(
+    async def _find_revoked_tokens(
+        self,
+        tokens: list[tuple[str, TokenClaimsModel | None]]
+    ) -> set[str]:
+        '''
+        Возвращает токены, присутствующие в базе невалидных токенов в Redis,
+        выполняя проверку за один запрос
+
+        :param tokens: проверяемые токены и их данные
+        '''
+
+        token_keys = [
+            self._get_lookup_keys(
+                token=token,
+                claims=claims
+            )
+            for token, claims in tokens
+        ]
+
+        lookup_keys = [key for candidate_keys in token_keys for key in candidate_keys]
+        if not lookup_keys:
+            return set()
+
+        results = iter(
+            await self.redis_session.mget(lookup_keys)
+        )
+
+        revoked_tokens = set()
+        for (token, _), candidate_keys in zip(tokens, token_keys):
+            if not candidate_keys:
+                continue
+
+            revoked = any([next(results) for _ in candidate_keys])
+            if revocation.revocation_filter is not None:
+                revocation.revocation_filter.record_confirmation(revoked)
+
+            if revoked:
+                revoked_tokens.add(token)
+
+        return revoked_tokens
+
+    async def disable_access_tokens(
+        self,
+        access_tokens: list[str]
+    ) -> None:
+        '''
+        Функция для отправки нескольких неактуальных access_token в Redis
+        за один конвейерный запрос
+
+        :param access_tokens: отправляемые access_token
+        '''
+
+        records = []
+        for access_token in access_tokens:
+            record = self._get_denylist_record(
+                token=access_token
+            )
+            token_cache.discard(access_token)
+
+            if record is not None:
+                records.append(record)
+
+        await self._revoke(
+            records=records
+        )
+
+    async def verify_access_token(
         self,
         access_token: str
-    ) -> bool:
+    ) -> TokenClaimsModel | None:
         '''
         Функция проверки валидности и актуальности access_token
+        с однократным разбором токена
 
         :param access_token: проверяемый access_token
+        :return: данные токена или None, если токен невалиден или отозван
         '''
 
-        if not self.check_token(
+        claims = self.decode_token(
             token=access_token
-        ):
-            return False
+        )
+
+        if claims is None:
+            return None
         elif await self.is_token_invalid(
-            token=access_token
+            token=access_token,
+            claims=claims
         ):
-            return False
+            return None
 
-        return True
+        return claims
+
+    async def verify_access_tokens(
+        self,
+        access_tokens: list[str]
+    ) -> list[TokenClaimsModel | None]:
+        '''
+        Функция проверки валидности и актуальности нескольких access_token
+        с одним запросом к Redis
+
+        :param access_tokens: проверяемые access_token
+        :return: данные токенов в порядке запроса; None для невалидных или отозванных
+        '''
+
+        decoded_tokens = [
+            (
+                access_token,
+                self.decode_token(
+                    token=access_token
+                )
+            )
+            for access_token in access_tokens
+        ]
+
+        revoked_tokens = await self._find_revoked_tokens(
+            tokens=[
+                (access_token, claims)
+                for access_token, claims in decoded_tokens
+                if claims is not None
+            ]
+        )
+
+        return [
+            None if access_token in revoked_tokens else claims
+            for access_token, claims in decoded_tokens
+        ]
+
+    async def check_access_token(
+        self,
+        access_token: str
+    ) -> bool:
+        '''
+        Функция проверки валидности и актуальности access_token
+
+        :param access_token: проверяемый access_token
+        '''
+
+        return await self.verify_access_token(
+            access_token=access_token
+        ) is not None
 
     async def get_data_from_access_token(
         self,
         access_token: str
-    ) -> tuple[str, str | None]:
+    ) -> str:
         '''
         Функция получения данных из access_token
 
         :param access_token: проверяемый access_token
         '''
 
-        if not await self.check_access_token(
+        claims = await self.verify_access_token(
             access_token=access_token
-        ):
+        )
+
+        if claims is None:
             raise self.credentials_exception
 
-        return super().get_data_from_token(
-            token=access_token
-        )
+        return claims.email
 
 
 def get_jwt_session(
@@ -0,0 +1,82 @@
+import hashlib
+from pathlib import Path
+
+from jose import jwk
+from jose.backends.base import Key
+
+from core.config import jwt_settings
+from core.json import dumps
+
+
+class KeyRing:
+    '''
+    Класс, содержащий ключи асимметричной подписи токенов.
+    Ключи загружаются из каталога, имя файла без расширения служит идентификатором ключа (kid):
+    `<kid>.pem` содержит закрытый ключ, `<kid>.pub.pem` - только открытый.
+    Новые токены подписываются активным ключом, остальные ключи используются только
+    для проверки ранее выпущенных токенов, поэтому после ротации закрытые ключи
+    выведенных из подписи идентификаторов можно заменить открытыми
+    '''
+
+    def __init__(
+        self,
+        keys_dir: str,
+        active_key_id: str,
+        algorithm: str
+    ):
+        self.algorithm = algorithm
+        self.public_keys: dict[str, Key] = {}
+        private_keys: dict[str, Key] = {}
+
+        for path in sorted(Path(keys_dir).glob('*.pem')):
+            key = jwk.construct(path.read_text(), algorithm)
+            if path.name.endswith('.pub.pem'):
+                self.public_keys.setdefault(path.name.removesuffix('.pub.pem'), key)
+                continue
+
+            private_keys[path.stem] = key
+            self.public_keys[path.stem] = key.public_key()
+
+        if active_key_id not in private_keys:
+            raise ValueError(f'Signing key {active_key_id!r} not found in {keys_dir}')
+
+        self.active_key_id = active_key_id
+        self.signing_key = private_keys[active_key_id]
+
+        self.jwks = dumps({
+            'keys': [
+                {
+                    **public_key.to_dict(),
+                    'kid': key_id,
+                    'use': 'sig'
+                }
+                for key_id, public_key in self.public_keys.items()
+            ]
+        })
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks.encode()).hexdigest()[:32]}"'
+
+    def get_verification_key(
+        self,
+        key_id: str | None
+    ) -> Key | None:
+        '''
+        Функция получения открытого ключа по его идентификатору
+
+        :param key_id: идентификатор ключа из заголовка токена
+        '''
+
+        return self.public_keys.get(key_id)
+
+
+def get_key_ring() -> KeyRing | None:
+    if jwt_settings.algorithm == 'HS256':
+        return None
+
+    return KeyRing(
+        keys_dir=jwt_settings.signing_keys_dir,
+        active_key_id=jwt_settings.active_key_id,
+        algorithm=jwt_settings.algorithm
+    )
+
+
+key_ring = get_key_ring()
@@ -0,0 +1,6 @@
+from dependencies import logon_history
+from dependencies.logon_history import LogonHistoryWriter
+
+
+def get_logon_history_session() -> LogonHistoryWriter:
+    return logon_history.logon_history_writer
@@ -1,12 +1,70 @@
+import asyncio
+import math
+
 import aiohttp
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 
-from core.config import GoogleSettings, YandexSettings
+from core.config import GoogleSettings, YandexSettings, oauth_client_settings
+from core.metrics import OAUTH_CIRCUIT_OPEN, OAUTH_REQUESTS
+from dependencies import http_client
 from schemas.user import UserOauthModel
+from utils.resilience import (Bulkhead, BulkheadFullError, CircuitBreaker,
+                              CircuitOpenError, retry_with_jitter)
+
+
+def is_provider_failure(exc: Exception) -> bool:
+    '''Функция, определяющая, свидетельствует ли ошибка о неисправности внешнего сервиса'''
+
+    if isinstance(exc, aiohttp.ContentTypeError):
+        return True
+
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500 or exc.status == status.HTTP_429_TOO_MANY_REQUESTS
+
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def is_connect_failure(exc: Exception) -> bool:
+    '''Функция, определяющая, что запрос не был отправлен из-за ошибки установки соединения'''
+
+    return isinstance(exc, aiohttp.ClientConnectorError)
+
+
+def get_bulkhead() -> Bulkhead:
+    return Bulkhead(
+        max_concurrency=oauth_client_settings.max_concurrency,
+        queue_timeout=oauth_client_settings.queue_timeout
+    )
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=oauth_client_settings.failure_threshold,
+        reset_timeout=oauth_client_settings.reset_timeout
+    )
 
 
 class OauthService:
-    '''Класс, обеспечивающий механизм получения данных пользователя от сервиса внешней авторизации'''
+    '''
+    Класс, обеспечивающий механизм получения данных пользователя от сервиса внешней авторизации.
+    Число одновременных обращений к каждому сервису ограничено, идемпотентные запросы
+    повторяются при сбоях, а при деградации сервиса обращения к нему отклоняются без ожидания
+    '''
+
+    provider: str
+    client_settings: GoogleSettings | YandexSettings
+    bulkhead: Bulkhead
+    circuit_breaker: CircuitBreaker
+
+    upstream_exception = HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail='Authorization service is unavailable'
+    )
+
+    invalid_code_exception = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail='Authorization code is invalid'
+    )
 
     def __init__(
         self,
@@ -25,18 +83,100 @@ class OauthService:
         :return: модель пользователя
         '''
 
-        oauth_token = await self._get_oauth_token(
-            authorization_code=authorization_code
+        # код авторизации одноразовый, поэтому запрос токена повторяется,
+        # только если он гарантированно не был отправлен
+        oauth_token = await self._call(
+            operation='token',
+            request=lambda: self._get_oauth_token(
+                authorization_code=authorization_code
+            ),
+            is_retryable=is_connect_failure
         )
 
-        user_data = await self._fetch_user_data(
-            oauth_token=oauth_token
+        user_data = await self._call(
+            operation='user_info',
+            request=lambda: self._fetch_user_data(
+                oauth_token=oauth_token
+            ),
+            is_retryable=is_provider_failure
         )
 
         return self._transform_user_data(
             user_data=user_data
         )
 
+    def _get_unavailable_exception(
+        self,
+        retry_after: float
+    ) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Authorization service is temporarily unavailable, try again later',
+            headers={
+                'Retry-After': str(max(math.ceil(retry_after), 1))
+            }
+        )
+
+    async def _call(
+        self,
+        operation: str,
+        request,
+        is_retryable
+    ):
+        '''
+        Функция выполнения запроса к внешнему сервису с ограничением числа одновременных
+        обращений, повторными попытками и проверкой предохранителя
+
+        :param operation: название запроса для метрик
+        :param request: корутинная функция без аргументов, выполняющая запрос
+        :param is_retryable: функция, определяющая по исключению, можно ли повторить запрос
+        '''
+
+        settings = oauth_client_settings
+        retries = OAUTH_REQUESTS.labels(self.provider, operation, 'retry')
+
+        try:
+            async with self.bulkhead.acquire():
+                self.circuit_breaker.before_call()
+
+                try:
+                    result = await retry_with_jitter(
+                        request,
+                        attempts=settings.retry_attempts,
+                        base_delay=settings.retry_base_delay,
+                        max_delay=settings.retry_max_delay,
+                        is_retryable=is_retryable,
+                        on_retry=lambda exc: retries.inc()
+                    )
+                    self.circuit_breaker.record_success()
+                except asyncio.CancelledError:
+                    self.circuit_breaker.release_probe()
+                    raise
+                except Exception as exc:
+                    if isinstance(exc, aiohttp.ClientResponseError) and not is_provider_failure(exc):
+                        self.circuit_breaker.record_success()
+                        OAUTH_REQUESTS.labels(self.provider, operation, 'client_error').inc()
+                        raise self.invalid_code_exception
+
+                    self.circuit_breaker.record_failure()
+                    OAUTH_REQUESTS.labels(self.provider, operation, 'error').inc()
+                    raise self.upstream_exception from exc
+                finally:
+                    OAUTH_CIRCUIT_OPEN.labels(self.provider).set(self.circuit_breaker.is_open)
+        except BulkheadFullError:
+            OAUTH_REQUESTS.labels(self.provider, operation, 'rejected').inc()
+            raise self._get_unavailable_exception(
+                retry_after=1
+            )
+        except CircuitOpenError:
+            OAUTH_REQUESTS.labels(self.provider, operation, 'circuit_open').inc()
+            raise self._get_unavailable_exception(
+                retry_after=self.circuit_breaker.retry_after
+            )
+
+        OAUTH_REQUESTS.labels(self.provider, operation, 'ok').inc()
+        return result
+
     async def _get_oauth_token(
         self,
         authorization_code: str
@@ -57,14 +197,10 @@ class OauthService:
         }
 
         async with self.session.post(
-            url=self.token_url,
+            url=self.client_settings.token_url,
             data=query
         ) as resp:
-            if not resp.ok:
-                raise aiohttp.ClientResponseError(
-                    request_info=resp.request_info,
-                    history=None
-                )
+            resp.raise_for_status()
 
             data = await resp.json()
             return data['access_token']
@@ -85,14 +221,10 @@ class OauthService:
         )
 
         async with self.session.get(
-            url=self.oauth_url,
+            url=self.client_settings.user_info_url,
             headers=headers
         ) as resp:
-            if not resp.ok:
-                raise aiohttp.ClientResponseError(
-                    request_info=resp.request_info,
-                    history=None
-                )
+            resp.raise_for_status()
 
             return await resp.json()
 
@@ -121,27 +253,29 @@ class OauthService:
 class YandexOauth(OauthService):
     '''Класс, обеспечивающий механизм получения данных пользователя от сервиса внешней авторизации Yandex'''
 
-    oauth_url = 'https://login.yandex.ru/info'
-    token_url = 'https://oauth.yandex.ru/token'
+    provider = 'yandex'
     client_settings = YandexSettings()
+    bulkhead = get_bulkhead()
+    circuit_breaker = get_circuit_breaker()
 
     def get_login_url(self) -> str:
         '''Функция для получения url, ведущего на страницу авторизации в сервисе Yandex'''
 
-        return f'https://oauth.yandex.ru/authorize?response_type=code&client_id={self.client_settings.client_id}'
+        return f'{self.client_settings.authorize_url}?response_type=code&client_id={self.client_settings.client_id}'
 
 
 class GoogleOauth(OauthService):
     '''Класс, обеспечивающий механизм получения данных пользователя от сервиса внешней авторизации Google'''
 
-    oauth_url = 'https://www.googleapis.com/oauth2/v1/userinfo'
-    token_url = 'https://accounts.google.com/o/oauth2/token'
+    provider = 'google'
     client_settings = GoogleSettings()
+    bulkhead = get_bulkhead()
+    circuit_breaker = get_circuit_breaker()
 
     def get_login_url(self) -> str:
         '''Функция для получения url, ведущего на страницу авторизации в сервисе Google'''
 
-        return f'https://accounts.google.com/o/oauth2/auth?response_type=code&client_id={self.client_settings.client_id}&redirect_uri={self.client_settings.redirect_uri}&scope=openid%20profile%20email&access_type=offline'
+        return f'{self.client_settings.authorize_url}?response_type=code&client_id={self.client_settings.client_id}&redirect_uri={self.client_settings.redirect_uri}&scope=openid%20profile%20email&access_type=offline'
 
     def _get_header(
         self,
@@ -159,9 +293,8 @@ class GoogleOauth(OauthService):
         }
 
 
-async def get_aiohttp_session():
-    async with aiohttp.ClientSession() as session:
-        yield session
+def get_aiohttp_session() -> aiohttp.ClientSession:
+    return http_client.http_session
 
 
 def get_google_oauth(
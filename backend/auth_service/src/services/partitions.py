@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from crud.partitions import maintain_partitions
+
+logger = logging.getLogger(__name__)
+
+
+async def run_partition_maintenance(
+    engine: AsyncEngine,
+    interval: float,
+    months_ahead: int,
+    retention_months: int,
+    archive_schema: str | None
+) -> None:
+    '''
+    Функция периодического обслуживания секций истории авторизаций,
+    чтобы секции на следующие месяцы существовали независимо от перезапусков сервиса
+
+    :param interval: интервал между запусками, секунд
+    :param months_ahead: число месяцев вперед, для которых создаются секции
+    :param retention_months: число полных месяцев, за которые хранится история
+    :param archive_schema: схема архива, при отсутствии секции удаляются
+    '''
+
+    while True:
+        try:
+            async with engine.connect() as connection:
+                connection = await connection.execution_options(
+                    isolation_level='AUTOCOMMIT'
+                )
+                result = await maintain_partitions(
+                    connection=connection,
+                    months_ahead=months_ahead,
+                    retention_months=retention_months,
+                    archive_schema=archive_schema
+                )
+
+            if result is not None and any(result):
+                created, removed = result
+                logger.info(
+                    'Logon history partitions created: %s, removed: %s',
+                    ', '.join(created) or 'none',
+                    ', '.join(removed) or 'none'
+                )
+        except (SQLAlchemyError, OSError):
+            logger.exception('Logon history partition maintenance failed')
+
+        await asyncio.sleep(interval)
@@ -0,0 +1,6 @@
+from dependencies import password
+from dependencies.password import PasswordHasher
+
+
+def get_password_session() -> PasswordHasher:
+    return password.password_hasher
@@ -0,0 +1,6 @@
+from dependencies import rate_limit
+from dependencies.rate_limit import RateLimiter
+
+
+def get_rate_limit_session() -> RateLimiter:
+    return rate_limit.rate_limiter
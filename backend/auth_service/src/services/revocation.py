@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import logging
+import math
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.metrics import (REVOCATION_FILTER_CHECKS,
+                          REVOCATION_FILTER_ESTIMATED_FPR,
+                          REVOCATION_FILTER_ITEMS)
+
+REVOCATION_CHANNEL = 'token_keeper:revoked'
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    '''Фильтр Блума фиксированного размера'''
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float
+    ):
+        self.size = max(
+            math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2),
+            8
+        )
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.items = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _get_positions(
+        self,
+        item: str
+    ):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(
+        self,
+        item: str
+    ) -> None:
+        for position in self._get_positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self.items += 1
+
+    def __contains__(
+        self,
+        item: str
+    ) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(item)
+        )
+
+    def estimate_error_rate(self) -> float:
+        '''Функция оценки вероятности ложноположительного ответа при текущем заполнении'''
+
+        return (1 - math.exp(-self.hash_count * self.items / self.size)) ** self.hash_count
+
+
+class RevocationFilter:
+    '''
+    Локальный вероятностный фильтр ключей отозванных токенов.
+    Отрицательный ответ фильтра позволяет не обращаться к Redis,
+    положительный требует подтверждения в Redis
+    '''
+
+    def __init__(
+        self,
+        redis_session: Redis,
+        key_patterns: list[str],
+        capacity: int,
+        error_rate: float,
+        rebuild_interval: int
+    ):
+        self.redis_session = redis_session
+        self.key_patterns = key_patterns
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.ready = False
+        self._filter = self._new_filter()
+        self._pending: BloomFilter | None = None
+
+    def _new_filter(self) -> BloomFilter:
+        return BloomFilter(
+            capacity=self.capacity,
+            error_rate=self.error_rate
+        )
+
+    def add(
+        self,
+        key: str
+    ) -> None:
+        '''
+        Функция добавления ключа отозванного токена в фильтр
+
+        :param key: ключ записи об отзыве токена в Redis
+        '''
+
+        self._filter.add(key)
+        if self._pending is not None:
+            self._pending.add(key)
+
+        REVOCATION_FILTER_ITEMS.set(self._filter.items)
+        REVOCATION_FILTER_ESTIMATED_FPR.set(self._filter.estimate_error_rate())
+
+    def get_candidates(
+        self,
+        keys: list[str]
+    ) -> list[str]:
+        '''
+        Функция отбора ключей, которые могут присутствовать в базе отозванных токенов.
+        Пока фильтр не построен, все ключи считаются возможно отозванными
+
+        :param keys: ключи записей об отзыве одного токена
+        '''
+
+        if not self.ready:
+            return keys
+
+        candidates = [key for key in keys if key in self._filter]
+        if not candidates:
+            REVOCATION_FILTER_CHECKS.labels('negative').inc()
+
+        return candidates
+
+    def record_confirmation(
+        self,
+        revoked: bool
+    ) -> None:
+        '''
+        Функция учета результата проверки в Redis после положительного ответа фильтра
+
+        :param revoked: подтвержден ли отзыв токена
+        '''
+
+        if self.ready:
+            REVOCATION_FILTER_CHECKS.labels(
+                'true_positive' if revoked else 'false_positive'
+            ).inc()
+
+    async def rebuild(self) -> None:
+        '''Функция перестроения фильтра по текущему содержимому Redis'''
+
+        self._pending = self._new_filter()
+
+        try:
+            for pattern in self.key_patterns:
+                async for key in self.redis_session.scan_iter(
+                    match=pattern,
+                    count=1000
+                ):
+                    self._pending.add(key)
+        except BaseException:
+            self._pending = None
+            raise
+
+        self._filter, self._pending = self._pending, None
+        self.ready = True
+
+        REVOCATION_FILTER_ITEMS.set(self._filter.items)
+        REVOCATION_FILTER_ESTIMATED_FPR.set(self._filter.estimate_error_rate())
+
+    async def _listen(self) -> None:
+        '''Функция получения ключей отозванных токенов от других узлов'''
+
+        async with self.redis_session.pubsub() as pubsub:
+            await pubsub.subscribe(REVOCATION_CHANNEL)
+            await self.rebuild()
+
+            loop = asyncio.get_running_loop()
+            rebuild_at = loop.time() + self.rebuild_interval
+
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0
+                )
+                if message is not None and message['type'] == 'message':
+                    self.add(message['data'])
+
+                if loop.time() >= rebuild_at:
+                    await self.rebuild()
+                    rebuild_at = loop.time() + self.rebuild_interval
+
+    async def run(self) -> None:
+        '''
+        Функция синхронизации фильтра. При потере подписки фильтр
+        отключается до повторной подписки и перестроения
+        '''
+
+        while True:
+            try:
+                await self._listen()
+            except (RedisError, OSError):
+                logger.exception('Revocation filter sync failed, falling back to Redis lookups')
+                self.ready = False
+                await asyncio.sleep(1)
+
+
+revocation_filter: RevocationFilter | None = None
@@ -0,0 +1,186 @@
+import time
+
+from fastapi import Depends
+from redis.asyncio.client import Redis
+
+from core.config import user_cache_settings
+from core.metrics import USER_CACHE_FALLTHROUGH_LATENCY, USER_CACHE_LOOKUPS
+from crud.user import get_user_ids
+from dependencies.postgres import LazySession
+from schemas.token import TokenClaimsModel
+from services.redis import get_redis_session
+from utils.cache import LRUCache
+
+USER_ID_PREFIX = 'user_id:'
+
+# Значение, которым в Redis отмечается отсутствие пользователя
+NOT_FOUND = ''
+
+MISSING = object()
+
+local_user_ids = LRUCache(
+    max_size=user_cache_settings.local_size
+)
+
+
+class UserService:
+    '''
+    Класс кеширующего чтения соответствия email и ID пользователя.
+    Поиск выполняется в памяти процесса, затем в Redis и только затем в БД.
+    Отсутствие пользователя кешируется на короткое время только в Redis:
+    сброс кеша при регистрации выполняется лишь в одном процессе,
+    и отрицательная запись в памяти других процессов скрывала бы нового пользователя
+    '''
+
+    def __init__(
+        self,
+        redis_session: Redis
+    ):
+        self.redis_session = redis_session
+        self.settings = user_cache_settings
+
+    def _store_locally(
+        self,
+        email: str,
+        user_id: str | None
+    ) -> None:
+        if user_id is None:
+            return
+
+        local_user_ids.put(
+            key=email,
+            value=user_id,
+            expires_at=time.time() + self.settings.local_ttl
+        )
+
+    async def get_user_ids(
+        self,
+        db_session: LazySession,
+        emails: list[str]
+    ) -> dict[str, str]:
+        '''
+        Функция получения ID пользователей по email
+
+        :param emails: искомые email
+        :return: соответствие email и ID найденных пользователей
+        '''
+
+        user_ids = {}
+        remote_emails = []
+
+        for email in dict.fromkeys(emails):
+            user_id = local_user_ids.get(email, MISSING)
+            if user_id is MISSING:
+                remote_emails.append(email)
+                continue
+
+            USER_CACHE_LOOKUPS.labels('local_hit').inc()
+            user_ids[email] = user_id
+
+        if not remote_emails:
+            return user_ids
+
+        cached_ids = await self.redis_session.mget(
+            [f'{USER_ID_PREFIX}{email}' for email in remote_emails]
+        )
+
+        missed_emails = []
+        for email, user_id in zip(remote_emails, cached_ids):
+            if user_id is None:
+                missed_emails.append(email)
+                continue
+
+            USER_CACHE_LOOKUPS.labels('redis_hit').inc()
+            user_id = user_id or None
+            self._store_locally(email, user_id)
+            if user_id is not None:
+                user_ids[email] = user_id
+
+        if not missed_emails:
+            return user_ids
+
+        USER_CACHE_LOOKUPS.labels('miss').inc(len(missed_emails))
+        start = time.perf_counter()
+
+        async with db_session.acquire() as session:
+            found_ids = await get_user_ids(
+                db_session=session,
+                emails=missed_emails
+            )
+
+        USER_CACHE_FALLTHROUGH_LATENCY.observe(time.perf_counter() - start)
+
+        async with self.redis_session.pipeline(transaction=False) as pipe:
+            for email in missed_emails:
+                user_id = found_ids.get(email)
+                if user_id is not None:
+                    user_id = str(user_id)
+                    user_ids[email] = user_id
+
+                self._store_locally(email, user_id)
+                pipe.set(
+                    name=f'{USER_ID_PREFIX}{email}',
+                    value=user_id if user_id is not None else NOT_FOUND,
+                    ex=self.settings.redis_ttl if user_id is not None else self.settings.negative_ttl
+                )
+
+            await pipe.execute()
+
+        return user_ids
+
+    async def get_user_id(
+        self,
+        db_session: LazySession,
+        email: str
+    ) -> str | None:
+        '''
+        Функция получения ID пользователя по email
+
+        :param email: искомый email
+        '''
+
+        user_ids = await self.get_user_ids(
+            db_session=db_session,
+            emails=[email]
+        )
+
+        return user_ids.get(email)
+
+    async def get_user_id_from_claims(
+        self,
+        db_session: LazySession,
+        claims: TokenClaimsModel
+    ) -> str | None:
+        '''
+        Функция получения ID пользователя по данным токена. Токены версии 2
+        содержат ID пользователя; для токенов, выпущенных до этого, ID ищется по email
+
+        :param claims: проверенные данные токена
+        '''
+
+        if claims.user_id is not None:
+            return claims.user_id
+
+        return await self.get_user_id(
+            db_session=db_session,
+            email=claims.email
+        )
+
+    async def invalidate(
+        self,
+        email: str
+    ) -> None:
+        '''
+        Функция сброса кешированного ID пользователя после его создания или изменения
+
+        :param email: email пользователя
+        '''
+
+        local_user_ids.discard(email)
+        await self.redis_session.delete(f'{USER_ID_PREFIX}{email}')
+
+
+def get_user_session(
+    redis_session=Depends(get_redis_session)
+) -> UserService:
+    return UserService(redis_session)
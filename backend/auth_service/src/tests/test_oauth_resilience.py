@@ -0,0 +1,259 @@
+import asyncio
+import socket
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+from fastapi import HTTPException, status
+
+from benchmarks.fake_oauth import create_app
+from core.config import oauth_client_settings
+from services.oauth import OauthService
+from utils.resilience import Bulkhead, CircuitBreaker
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class FakeOauth(OauthService):
+    provider = 'fake'
+
+
+class OauthResilienceTestCase(unittest.IsolatedAsyncioTestCase):
+    '''Проверки клиента OAuth на локальном сервисе внешней авторизации benchmarks/fake_oauth.py'''
+
+    async def asyncSetUp(self):
+        self.settings_backup = oauth_client_settings.model_dump()
+        oauth_client_settings.retry_attempts = 3
+        oauth_client_settings.retry_base_delay = 0.01
+        oauth_client_settings.retry_max_delay = 0.02
+
+        # Число запросов к каждому адресу, включая попытки, не установившие соединение
+        self.attempts = Counter()
+        self.on_connect_error = None
+
+        async def on_request_start(session, context, params):
+            self.attempts[params.url.path] += 1
+
+        async def on_request_exception(session, context, params):
+            if self.on_connect_error is not None:
+                await self.on_connect_error()
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_exception.append(on_request_exception)
+
+        self.session = aiohttp.ClientSession(trace_configs=[trace_config])
+        self.runners = []
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        for runner in self.runners:
+            await runner.cleanup()
+
+        for name, value in self.settings_backup.items():
+            setattr(oauth_client_settings, name, value)
+
+    async def start_server(
+        self,
+        port: int | None = None,
+        latency: float = 0,
+        error_rate: float = 0,
+        error_status: int = 503
+    ) -> str:
+        port = port or get_free_port()
+        runner = web.AppRunner(
+            create_app(
+                latency=latency,
+                error_rate=error_rate,
+                error_status=error_status
+            )
+        )
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+        self.runners.append(runner)
+
+        return f'http://127.0.0.1:{port}'
+
+    def get_service(
+        self,
+        token_server: str,
+        user_info_server: str | None = None,
+        max_concurrency: int = 10,
+        queue_timeout: float = 1,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30
+    ) -> FakeOauth:
+        service = FakeOauth(self.session)
+        service.client_settings = SimpleNamespace(
+            client_id='client',
+            client_secret='secret',
+            redirect_uri='http://127.0.0.1/callback',
+            token_url=f'{token_server}/token',
+            user_info_url=f'{user_info_server or token_server}/info'
+        )
+        service.bulkhead = Bulkhead(
+            max_concurrency=max_concurrency,
+            queue_timeout=queue_timeout
+        )
+        service.circuit_breaker = CircuitBreaker(
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout
+        )
+
+        return service
+
+    async def test_circuit_breaker_opens_and_half_opens(self):
+        failing_server = await self.start_server(
+            error_rate=1
+        )
+        healthy_server = await self.start_server()
+        service = self.get_service(
+            token_server=failing_server,
+            failure_threshold=2,
+            reset_timeout=0.2
+        )
+
+        for _ in range(2):
+            with self.assertRaises(HTTPException) as error:
+                await service.get_user_data('code')
+            self.assertEqual(error.exception.status_code, status.HTTP_502_BAD_GATEWAY)
+
+        # Разомкнутый предохранитель отклоняет вызов, не обращаясь к сервису
+        with self.assertRaises(HTTPException) as error:
+            await service.get_user_data('code')
+        self.assertEqual(error.exception.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', error.exception.headers)
+        self.assertEqual(self.attempts['/token'], 2)
+
+        # Неудачный пробный вызов снова размыкает предохранитель
+        await asyncio.sleep(0.25)
+        with self.assertRaises(HTTPException) as error:
+            await service.get_user_data('code')
+        self.assertEqual(error.exception.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.assertTrue(service.circuit_breaker.is_open)
+        self.assertEqual(self.attempts['/token'], 3)
+
+        # Успешный пробный вызов замыкает предохранитель
+        await asyncio.sleep(0.25)
+        service.client_settings.token_url = f'{healthy_server}/token'
+        service.client_settings.user_info_url = f'{healthy_server}/info'
+
+        user = await service.get_user_data('code')
+        self.assertTrue(user.email.endswith('@fake-oauth.local'))
+        self.assertFalse(service.circuit_breaker.is_open)
+
+    async def test_bulkhead_rejects_when_saturated(self):
+        server = await self.start_server(
+            latency=0.3
+        )
+        service = self.get_service(
+            token_server=server,
+            max_concurrency=1,
+            queue_timeout=0.05
+        )
+
+        results = await asyncio.gather(
+            service.get_user_data('code'),
+            service.get_user_data('code'),
+            return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, HTTPException)]
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(errors[0].headers['Retry-After'], '1')
+        self.assertEqual(self.attempts['/token'], 1)
+
+    async def test_user_info_is_retried_on_connect_error(self):
+        token_server = await self.start_server()
+        user_info_port = get_free_port()
+
+        # Сервис данных пользователя становится доступен после первой неудачной попытки
+        async def start_user_info_server():
+            self.on_connect_error = None
+            await self.start_server(
+                port=user_info_port
+            )
+
+        self.on_connect_error = start_user_info_server
+        service = self.get_service(
+            token_server=token_server,
+            user_info_server=f'http://127.0.0.1:{user_info_port}'
+        )
+
+        await service.get_user_data('code')
+
+        self.assertEqual(self.attempts['/token'], 1)
+        self.assertEqual(self.attempts['/info'], 2)
+
+    async def test_user_info_retries_are_limited(self):
+        token_server = await self.start_server()
+        service = self.get_service(
+            token_server=token_server,
+            user_info_server=f'http://127.0.0.1:{get_free_port()}'
+        )
+
+        with self.assertRaises(HTTPException) as error:
+            await service.get_user_data('code')
+
+        self.assertEqual(error.exception.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.assertEqual(self.attempts['/info'], oauth_client_settings.retry_attempts)
+
+    async def test_token_exchange_is_not_retried_on_server_error(self):
+        server = await self.start_server(
+            error_rate=1
+        )
+        service = self.get_service(
+            token_server=server
+        )
+
+        with self.assertRaises(HTTPException) as error:
+            await service.get_user_data('code')
+
+        self.assertEqual(error.exception.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.assertEqual(self.attempts['/token'], 1)
+        self.assertEqual(self.attempts['/info'], 0)
+
+    async def test_token_exchange_is_not_retried_on_invalid_code(self):
+        server = await self.start_server()
+        service = self.get_service(
+            token_server=server,
+            failure_threshold=1
+        )
+
+        with self.assertRaises(HTTPException) as error:
+            await service.get_user_data('invalid')
+
+        self.assertEqual(error.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.attempts['/token'], 1)
+        self.assertFalse(service.circuit_breaker.is_open)
+
+    async def test_token_exchange_is_retried_on_connect_error(self):
+        port = get_free_port()
+
+        # Запрос, не установивший соединение, не доставил код авторизации и может быть повторен
+        async def start_oauth_server():
+            self.on_connect_error = None
+            await self.start_server(
+                port=port
+            )
+
+        self.on_connect_error = start_oauth_server
+        service = self.get_service(
+            token_server=f'http://127.0.0.1:{port}'
+        )
+
+        await service.get_user_data('code')
+
+        self.assertEqual(self.attempts['/token'], 2)
+        self.assertEqual(self.attempts['/info'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
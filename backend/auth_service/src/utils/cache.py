@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    '''
+    Ограниченный по размеру LRU-кеш в памяти процесса.
+    Каждая запись хранится до указанного момента времени
+    '''
+
+    def __init__(
+        self,
+        max_size: int
+    ):
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(
+        self,
+        key: Hashable,
+        default: Any = None
+    ) -> Any:
+        '''
+        Функция получения значения из кеша
+
+        :param key: ключ записи
+        :param default: значение, возвращаемое при отсутствии записи
+        '''
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        expires_at: float
+    ) -> None:
+        '''
+        Функция сохранения значения в кеш
+
+        :param key: ключ записи
+        :param value: сохраняемое значение
+        :param expires_at: момент истечения записи, unix-время
+        '''
+
+        if not self.max_size:
+            return
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(
+        self,
+        key: Hashable
+    ) -> None:
+        '''
+        Функция удаления записи из кеша
+
+        :param key: ключ записи
+        '''
+
+        self._entries.pop(key, None)
@@ -0,0 +1,44 @@
+import base64
+import uuid
+from datetime import datetime
+
+import orjson
+from fastapi import HTTPException, status
+
+invalid_cursor_exception = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail='Invalid pagination cursor'
+)
+
+
+def encode_cursor(
+    logon_time: datetime,
+    row_id: uuid.UUID
+) -> str:
+    '''
+    Функция формирования токена продолжения по последней записи страницы
+
+    :param logon_time: время авторизации последней записи
+    :param row_id: ID последней записи
+    '''
+
+    payload = orjson.dumps([logon_time.isoformat(), str(row_id)])
+
+    return base64.urlsafe_b64encode(payload).rstrip(b'=').decode()
+
+
+def decode_cursor(
+    cursor: str
+) -> tuple[datetime, uuid.UUID]:
+    '''
+    Функция получения позиции последней записи страницы из токена продолжения
+
+    :param cursor: токен продолжения
+    '''
+
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        logon_time, row_id = orjson.loads(payload)
+        return datetime.fromisoformat(logon_time), uuid.UUID(row_id)
+    except (ValueError, TypeError, AttributeError):
+        raise invalid_cursor_exception
@@ -0,0 +1,127 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+
+
+class BulkheadFullError(Exception):
+    '''Ошибка ожидания свободного места в ограничителе одновременных вызовов'''
+
+
+class CircuitOpenError(Exception):
+    '''Ошибка вызова при разомкнутом предохранителе'''
+
+
+class Bulkhead:
+    '''Ограничитель числа одновременных вызовов с ограниченным временем ожидания'''
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        queue_timeout: float
+    ):
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def acquire(self):
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise BulkheadFullError
+
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+class CircuitBreaker:
+    '''
+    Предохранитель, размыкающийся после заданного числа ошибок подряд.
+    Через reset_timeout пропускается один пробный вызов: при успехе предохранитель
+    замыкается, при ошибке снова размыкается
+    '''
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    @property
+    def retry_after(self) -> float:
+        '''Время до пробного вызова, секунд'''
+
+        if self.opened_at is None:
+            return 0
+
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0)
+
+    def before_call(self) -> None:
+        '''Функция проверки возможности вызова, вызывает CircuitOpenError при разомкнутом предохранителе'''
+
+        if self.opened_at is None:
+            return
+
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            raise CircuitOpenError
+
+        self._probing = True
+
+    def release_probe(self) -> None:
+        '''Функция освобождения пробного вызова, прерванного без результата'''
+
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+async def retry_with_jitter(
+    func,
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+    is_retryable,
+    on_retry=None
+):
+    '''
+    Функция повторного выполнения вызова с экспоненциальной задержкой и случайным разбросом
+
+    :param func: корутинная функция без аргументов
+    :param attempts: максимальное число попыток
+    :param base_delay: задержка перед второй попыткой, секунд
+    :param max_delay: максимальная задержка, секунд
+    :param is_retryable: функция, определяющая по исключению, можно ли повторить вызов
+    :param on_retry: функция, вызываемая с исключением перед повторной попыткой
+    '''
+
+    for attempt in range(attempts):
+        try:
+            return await func()
+        except Exception as exc:
+            if attempt == attempts - 1 or not is_retryable(exc):
+                raise
+
+            if on_retry is not None:
+                on_retry(exc)
+
+        await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
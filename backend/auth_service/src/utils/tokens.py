@@ -1,27 +1,32 @@
 from typing import Tuple
 
-from fastapi import Response
+from fastapi import Request, Response
 
 from core.globals import COOKIE_PREFIX
+from schemas.token import TokenClaimsModel
 from services.jwt import JWTService
 
 
 def create_tokens(
     jwt_session: JWTService,
-    email: str
+    email: str,
+    user_id: str
 ) -> Tuple[str, str]:
     '''
     Функция создания токенов для конкретного пользователя
 
     :param email: email пользователяя
+    :param user_id: ID пользователя
     '''
 
     access_token = jwt_session.create_access_token(
-        email=email
+        email=email,
+        user_id=user_id
     )
 
     refresh_token = jwt_session.create_refresh_token(
-        email=email
+        email=email,
+        user_id=user_id
     )
 
     return access_token, refresh_token
@@ -48,3 +53,31 @@ def set_tokens_to_cookies(
         key=f'{COOKIE_PREFIX}_refresh_token',
         value=refresh_token
     )
+
+
+async def get_access_token_claims(
+    request: Request,
+    jwt_session: JWTService
+) -> TokenClaimsModel | None:
+    '''
+    Функция получения проверенных данных access_token из cookie запроса.
+    Результат проверки сохраняется в состоянии запроса, поэтому токен
+    разбирается один раз за запрос
+
+    :param request: запрос клиента
+    :param jwt_session: сервис работы с JWT
+    '''
+
+    if hasattr(request.state, 'access_token_claims'):
+        return request.state.access_token_claims
+
+    access_token = request.cookies.get(f'{COOKIE_PREFIX}_access_token')
+
+    claims = None
+    if access_token:
+        claims = await jwt_session.verify_access_token(
+            access_token=access_token
+        )
+
+    request.state.access_token_claims = claims
+    return claims
@@ -2,8 +2,8 @@ from functools import wraps
 
 from fastapi import HTTPException, Request, status
 
-from core.globals import COOKIE_PREFIX
 from services.jwt import JWTService
+from utils.tokens import get_access_token_claims
 
 
 def if_token_is_valid(func):
@@ -12,17 +12,10 @@ def if_token_is_valid(func):
         request: Request = kwargs.get('request')
         jwt_session: JWTService = kwargs.get('jwt_session')
 
-        access_token = request.cookies.get(f'{COOKIE_PREFIX}_access_token')
-
-        if not access_token:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail='Sign in required!'
-            )
-
-        if not await jwt_session.check_access_token(
-            access_token=access_token
-        ):
+        if await get_access_token_claims(
+            request=request,
+            jwt_session=jwt_session
+        ) is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail='Sign in required!'